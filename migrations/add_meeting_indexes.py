@@ -0,0 +1,37 @@
+"""
+Migration to add a composite index for the overdue-managers anti-join:
+- ix_meetings_manager_status_time on meetings (manager_id, status, scheduled_time)
+init_db creates it on every start (in a transaction); run this script by hand to build
+it CONCURRENTLY on a large PostgreSQL database before deploying.
+"""
+import logging
+from sqlalchemy import create_engine, text
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+INDEXES = {
+    "ix_meetings_manager_status_time": "meetings (manager_id, status, scheduled_time)",
+}
+
+def upgrade():
+    """Create missing meeting indexes (idempotent, CONCURRENTLY on PostgreSQL)."""
+    engine = create_engine(settings.database_url)
+    concurrently = "CONCURRENTLY " if settings.database_url.startswith('postgresql') else ""
+    
+    try:
+        # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for index_name, target in INDEXES.items():
+                conn.execute(text(f"CREATE INDEX {concurrently}IF NOT EXISTS {index_name} ON {target}"))
+                logger.info(f"✅ Index {index_name} is in place")
+                
+    except Exception as e:
+        logger.error(f"❌ Migration failed: {e}")
+        raise
+    finally:
+        engine.dispose()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    upgrade()
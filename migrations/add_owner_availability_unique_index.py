@@ -0,0 +1,32 @@
+"""
+Migration to add unique index (owner_id, day_of_week, time_slot) to owner_availability.
+Required by the INSERT ... ON CONFLICT upsert in OwnerService.set_owner_time_slots.
+"""
+import logging
+from sqlalchemy import create_engine
+from config import settings
+from database import ensure_model_indexes
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = "ix_oa_owner_day_slot"
+
+def upgrade(engine=None):
+    """Remove duplicate slots and create the unique index with the other model indexes (idempotent).
+    init_db does the same on every start; this script is for running it by hand."""
+    owns_engine = engine is None
+    if owns_engine:
+        engine = create_engine(settings.database_url)
+    
+    try:
+        ensure_model_indexes(engine)
+    except Exception as e:
+        logger.error(f"❌ Migration failed: {e}")
+        raise
+    finally:
+        if owns_engine:
+            engine.dispose()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    upgrade()
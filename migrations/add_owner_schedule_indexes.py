@@ -0,0 +1,47 @@
+"""
+Migration to add composite indexes for owner availability and blocked time lookups:
+- ix_owner_avail_lookup on owner_availability (owner_id, day_of_week, is_active, time_slot)
+- ix_obt_owner_range on owner_blocked_time (owner_id, blocked_from, blocked_to)
+- ix_obt_owner_to on owner_blocked_time (owner_id, blocked_to)
+Drops ix_oa_owner_day_active, which ix_owner_avail_lookup supersedes.
+init_db creates these on every start (in a transaction); run this script by hand to build
+them CONCURRENTLY on a large PostgreSQL database before deploying.
+"""
+import logging
+from sqlalchemy import create_engine, text
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+INDEXES = {
+    "ix_owner_avail_lookup": "owner_availability (owner_id, day_of_week, is_active, time_slot)",
+    "ix_obt_owner_range": "owner_blocked_time (owner_id, blocked_from, blocked_to)",
+    "ix_obt_owner_to": "owner_blocked_time (owner_id, blocked_to)",
+}
+
+SUPERSEDED_INDEXES = ["ix_oa_owner_day_active"]
+
+def upgrade():
+    """Create missing indexes and drop superseded ones (idempotent, CONCURRENTLY on PostgreSQL)."""
+    engine = create_engine(settings.database_url)
+    concurrently = "CONCURRENTLY " if settings.database_url.startswith('postgresql') else ""
+    
+    try:
+        # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for index_name, target in INDEXES.items():
+                conn.execute(text(f"CREATE INDEX {concurrently}IF NOT EXISTS {index_name} ON {target}"))
+                logger.info(f"✅ Index {index_name} is in place")
+            
+            for index_name in SUPERSEDED_INDEXES:
+                conn.execute(text(f"DROP INDEX {concurrently}IF EXISTS {index_name}"))
+                
+    except Exception as e:
+        logger.error(f"❌ Migration failed: {e}")
+        raise
+    finally:
+        engine.dispose()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    upgrade()
@@ -0,0 +1,43 @@
+"""
+Migration to add indexes for reminder polling and cleanup:
+- ix_reminders_pending on reminders (scheduled_for) WHERE sent = false (partial)
+- ix_reminders_user_meeting on reminders (user_id, meeting_id)
+init_db creates these on every start (in a transaction); run this script by hand to build
+them CONCURRENTLY on a large PostgreSQL database before deploying.
+"""
+import logging
+from sqlalchemy import create_engine, text
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+def _indexes(is_postgres: bool) -> dict:
+    # Условие должно совпадать с тем, как SQLAlchemy рендерит sent == False, иначе планировщик не возьмет индекс
+    unsent = "false" if is_postgres else "0"
+    return {
+        "ix_reminders_pending": f"reminders (scheduled_for) WHERE sent = {unsent}",
+        "ix_reminders_user_meeting": "reminders (user_id, meeting_id)",
+    }
+
+def upgrade():
+    """Create missing reminder indexes (idempotent, CONCURRENTLY on PostgreSQL)."""
+    engine = create_engine(settings.database_url)
+    is_postgres = settings.database_url.startswith('postgresql')
+    concurrently = "CONCURRENTLY " if is_postgres else ""
+    
+    try:
+        # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for index_name, target in _indexes(is_postgres).items():
+                conn.execute(text(f"CREATE INDEX {concurrently}IF NOT EXISTS {index_name} ON {target}"))
+                logger.info(f"✅ Index {index_name} is in place")
+                
+    except Exception as e:
+        logger.error(f"❌ Migration failed: {e}")
+        raise
+    finally:
+        engine.dispose()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    upgrade()
@@ -1,5 +1,6 @@
 import os
-from typing import Optional, List
+from functools import cached_property
+from typing import Optional, List, FrozenSet
 from pydantic import Field, validator
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
@@ -155,6 +156,11 @@ class Settings(BaseSettings):
             return [int(id.strip()) for id in self.admin_telegram_ids.split(',') if id.strip()]
         return []
     
+    @cached_property
+    def admin_ids_set(self) -> FrozenSet[int]:
+        """Admin IDs as a frozenset for O(1) membership checks (parsed once)."""
+        return frozenset(self.admin_ids_list)
+    
     def validate_google_calendar_config(self) -> bool:
         """Validate Google Calendar configuration."""
         if not self.google_calendar_enabled:
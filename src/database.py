@@ -1,11 +1,14 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, ForeignKey, Enum, Text, text
+from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, ForeignKey, Enum, Text, Index, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship, Session
 from sqlalchemy.sql import func
 import enum
 from datetime import datetime
 from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
 import logging
+import threading
 
 from config import settings
 
@@ -78,6 +81,11 @@ class Meeting(Base):
     
     manager = relationship("User", back_populates="meetings")
     
+    __table_args__ = (
+        # Анти-join просроченных руководителей: manager_id и status по равенству, scheduled_time по диапазону
+        Index("ix_meetings_manager_status_time", "manager_id", "status", "scheduled_time"),
+    )
+    
 class Reminder(Base):
     __tablename__ = "reminders"
     
@@ -91,6 +99,16 @@ class Reminder(Base):
     created_at = Column(DateTime, server_default=func.now())
     
     user = relationship("User", back_populates="reminders")
+    meeting = relationship("Meeting")
+    
+    __table_args__ = (
+        # Частичный индекс: process_pending_reminders читает только неотправленные напоминания.
+        # Условие повторяет то, как SQLAlchemy рендерит sent == False в каждом диалекте
+        Index("ix_reminders_pending", "scheduled_for",
+              postgresql_where=text("sent = false"), sqlite_where=text("sent = 0")),
+        # Очистка напоминаний пользователя в schedule_next_meeting_reminders
+        Index("ix_reminders_user_meeting", "user_id", "meeting_id"),
+    )
 
 class OwnerAvailability(Base):
     """Доступные временные слоты для владельцев по дням недели"""
@@ -105,6 +123,13 @@ class OwnerAvailability(Base):
     updated_at = Column(DateTime, onupdate=func.now())
     
     owner = relationship("User", foreign_keys=[owner_id])
+    
+    __table_args__ = (
+        # Равенства впереди, time_slot последним - выборка слотов дня читается из индекса уже упорядоченной
+        Index("ix_owner_avail_lookup", "owner_id", "day_of_week", "is_active", "time_slot"),
+        # Цель ON CONFLICT в OwnerService.set_owner_time_slots
+        Index("ix_oa_owner_day_slot", "owner_id", "day_of_week", "time_slot", unique=True),
+    )
 
 class OwnerBlockedTime(Base):
     """Заблокированное время владельцев"""
@@ -118,6 +143,12 @@ class OwnerBlockedTime(Base):
     created_at = Column(DateTime, server_default=func.now())
     
     owner = relationship("User", foreign_keys=[owner_id])
+    
+    __table_args__ = (
+        Index("ix_obt_owner_range", "owner_id", "blocked_from", "blocked_to"),
+        # Для "blocked_to >= начало окна" - отсекает уже закончившиеся блокировки
+        Index("ix_obt_owner_to", "owner_id", "blocked_to"),
+    )
 
 class Statistics(Base):
     __tablename__ = "statistics"
@@ -167,8 +198,46 @@ else:
     )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Сессия, общая для всех get_db() при обработке одного апдейта Telegram (см. update_session_scope)
+_update_session: ContextVar[Optional[Session]] = ContextVar("update_session", default=None)
+
+@contextmanager
+def update_session_scope():
+    """Одна сессия на весь апдейт: декораторы и хендлеры переиспользуют ее вместо новой на каждый get_db().
+    
+    Контракт для get_db() внутри апдейта:
+    - внешний блок get_db() ведет себя как отдельная сессия: при выходе сессия закрывается -
+      незакоммиченные изменения откатываются, объекты отсоединяются, соединение возвращается
+      в пул. Поэтому между блоками (в том числе на сетевых await хендлера) соединение не занято;
+    - вложенный блок работает в транзакции внешнего и при выходе ее не трогает: изменения
+      внешнего блока сохраняются, коммит или откат остаются за ним;
+    - код в другом потоке (asyncio.to_thread копирует контекст) получает свою сессию.
+    """
+    db = SessionLocal()
+    db.info['owner_thread'] = threading.get_ident()
+    db.info['depth'] = 0
+    token = _update_session.set(db)
+    try:
+        yield db
+    finally:
+        _update_session.reset(token)
+        db.close()
+
 @contextmanager
 def get_db():
+    shared = _update_session.get()
+    # Session не потокобезопасна: код, вынесенный в поток, получает свою
+    if shared is not None and shared.info.get('owner_thread') == threading.get_ident():
+        shared.info['depth'] += 1
+        try:
+            yield shared
+        finally:
+            shared.info['depth'] -= 1
+            # close() оставляет сессию пригодной для следующих блоков апдейта
+            if shared.info['depth'] == 0:
+                shared.close()
+        return
+    
     db = SessionLocal()
     try:
         yield db
@@ -263,6 +332,45 @@ def _ensure_missing_fields_exist():
         logger.warning(f"⚠️ Не удалось проверить/добавить поля: {e}")
         # Не прерываем инициализацию из-за этого
 
+# Старые версии могли записать один слот дважды - такие дубликаты не дают создать ix_oa_owner_day_slot.
+# Из дубликатов остается активная строка (при нескольких - самая ранняя), чтобы владелец
+# не потерял слот, если рядом с ним лежит старая отключенная копия.
+# CASE вместо ORDER BY is_active DESC: в PostgreSQL NULL при DESC идет первым
+OWNER_SLOTS_DEDUPLICATE_SQL = """
+    DELETE FROM owner_availability
+    WHERE id IN (
+        SELECT id FROM (
+            SELECT id, ROW_NUMBER() OVER (
+                PARTITION BY owner_id, day_of_week, time_slot
+                ORDER BY CASE WHEN is_active THEN 0 ELSE 1 END, id
+            ) AS row_num
+            FROM owner_availability
+        ) ranked
+        WHERE row_num > 1
+    )
+"""
+
+# Индексы прежних версий, которые перекрывает объявленный в модели индекс
+SUPERSEDED_INDEXES = ["ix_oa_owner_day_active"]  # -> ix_owner_avail_lookup
+
+def ensure_model_indexes(bind=None):
+    """Индексы из __table_args__ моделей: create_all создает их только вместе с новой таблицей,
+    поэтому в существующую базу они добавляются здесь, а не в migrations/ (этого пакета нет
+    в Docker-образе). Без ix_oa_owner_day_slot падает upsert ON CONFLICT в OwnerService."""
+    bind = bind or engine
+    with bind.begin() as conn:
+        result = conn.execute(text(OWNER_SLOTS_DEDUPLICATE_SQL))
+        if result.rowcount:
+            logger.info(f"🧹 Удалено дубликатов слотов владельцев: {result.rowcount}")
+        
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+        
+        for index_name in SUPERSEDED_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+    logger.info("✅ Индексы моделей на месте")
+
 def init_db():
     """Initialize database with bulletproof error handling and auto-migration."""
     logger.info("🚀 DATABASE INIT: ========== STARTING ==========")
@@ -333,6 +441,10 @@ def init_db():
                     raise
         else:
             raise
+    
+    # Вне try: ошибка здесь не должна запускать пересоздание таблиц выше и должна
+    # остановить запуск - без индексов запись слотов владельцев не работает
+    ensure_model_indexes()
 
 if __name__ == "__main__":
     print("Initializing database...")
@@ -6,6 +6,7 @@ from sqlalchemy import and_
 
 from database import get_db, User, Meeting, UserRole, UserStatus, MeetingStatus, Department
 from config import settings
+from services.user_service import UserService
 from utils.decorators import require_admin
 
 logger = logging.getLogger(__name__)
@@ -177,6 +178,7 @@ async def approve_user(update: Update, context: ContextTypes.DEFAULT_TYPE, user_
         
         user.role = UserRole.MANAGER
         db.commit()
+        UserService.invalidate_user_cache(user.telegram_id)
         
         # Notify user
         try:
@@ -215,6 +217,7 @@ async def reject_user(update: Update, context: ContextTypes.DEFAULT_TYPE, user_i
         # Delete user
         db.delete(user)
         db.commit()
+        UserService.invalidate_user_cache(user.telegram_id)
         
         await update.callback_query.edit_message_text(
             f"❌ Заявка {user.first_name} {user.last_name} отклонена.\n"
@@ -366,6 +369,7 @@ async def approve_user_callback(update: Update, context: ContextTypes.DEFAULT_TY
         
         user.role = UserRole.MANAGER
         db.commit()
+        UserService.invalidate_user_cache(user.telegram_id)
         
         # Notify user
         try:
@@ -423,6 +427,7 @@ async def reject_user_callback(update: Update, context: ContextTypes.DEFAULT_TYP
         # Delete user
         db.delete(user)
         db.commit()
+        UserService.invalidate_user_cache(user.telegram_id)
         
         keyboard = [
             [InlineKeyboardButton("👥 Показать ожидающих", callback_data="admin_pending")],
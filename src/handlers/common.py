@@ -4,6 +4,8 @@ import logging
 
 from database import get_db, User, UserRole
 from config import settings
+from services.owner_service import OwnerService
+from services.user_service import UserService
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +35,7 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         user = db.query(User).filter(User.telegram_id == user_id).first()
         
         # Проверяем, является ли пользователь владельцем и автоматически создаем/обновляем
-        if user_id in settings.admin_ids_list:
+        if user_id in settings.admin_ids_set:
             if not user:
                 # Создаем владельца
                 from database import Department
@@ -47,11 +49,14 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 )
                 db.add(user)
                 db.commit()
+                OwnerService.invalidate_owner_cache()
                 logger.info(f"Auto-created owner user {user_id} via /start")
             elif user.role != UserRole.OWNER:
                 # Обновляем роль
                 user.role = UserRole.OWNER
                 db.commit()
+                OwnerService.invalidate_owner_cache()
+                UserService.invalidate_user_cache(user_id)
                 logger.info(f"Updated user {user_id} to OWNER role via /start")
         
         # Восстанавливаем сохраненные данные
@@ -9,6 +9,7 @@ from telegram.error import BadRequest
 
 from database import get_db, User, UserRole
 from utils.decorators import require_registration
+from services.owner_service import OwnerService
 from utils.telegram_safe import safe_send_message, safe_context_send
 from config import settings
 
@@ -459,6 +460,7 @@ async def disconnect_calendar_handler(update: Update, context: ContextTypes.DEFA
             user.google_calendar_id = None
             user.calendar_connected = False
             db.commit()
+            OwnerService.invalidate_calendar_cache()
             
             role_name = "владельца" if user.role == UserRole.OWNER else "руководителя"
             await safe_send_message(update,
@@ -539,6 +541,7 @@ async def switch_to_simple_calendar(update: Update, context: ContextTypes.DEFAUL
             user.calendar_connected = False
             # Сохраняем google_calendar_id если есть
             db.commit()
+            OwnerService.invalidate_calendar_cache()
     
     # Показываем инструкцию для простого подключения
     await simple_calendar_connect(update, context)
\ No newline at end of file
@@ -9,6 +9,7 @@ from telegram.ext import ContextTypes, ConversationHandler, CommandHandler, Call
 
 from database import get_db, User, UserRole, Department, UserStatus
 from services.owner_service import OwnerService, WEEKDAYS, TIME_SLOTS
+from services.user_service import UserService
 from utils.decorators import require_owner
 from config import settings
 
@@ -99,9 +100,10 @@ async def start_remove_slot(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = OwnerService.get_owner_by_telegram_id(update.effective_user.id)
     keyboard = []
     
-    # Показываем только дни, где есть слоты
+    # Показываем только дни, где есть слоты (вся неделя одним запросом)
+    slots_by_day = OwnerService.get_owner_week_slots(user.id)
     for i, day in enumerate(WEEKDAYS):
-        slots = OwnerService.get_owner_time_slots(user.id, i)
+        slots = slots_by_day.get(i)
         if slots:
             keyboard.append([InlineKeyboardButton(f"{day} ({', '.join(slots)})", callback_data=f"remove_slot_day_{i}")])
     
@@ -350,6 +352,7 @@ async def approve_manager(update: Update, context: ContextTypes.DEFAULT_TYPE):
         # Одобряем пользователя
         user.role = UserRole.MANAGER
         db.commit()
+        UserService.invalidate_user_cache(user.telegram_id)
         
         # Уведомляем пользователя
         try:
@@ -11,6 +11,7 @@ import logging
 
 from database import get_db, User, UserRole, Department
 from config import settings
+from services.owner_service import OwnerService
 
 logger = logging.getLogger(__name__)
 
@@ -48,7 +49,7 @@ async def start_registration(update: Update, context: ContextTypes.DEFAULT_TYPE)
             return ConversationHandler.END
     
     # Проверяем, является ли пользователь владельцем
-    if user_id in settings.admin_ids_list:
+    if user_id in settings.admin_ids_set:
         # Автоматически регистрируем владельца
         with get_db() as db:
             owner_user = User(
@@ -61,6 +62,7 @@ async def start_registration(update: Update, context: ContextTypes.DEFAULT_TYPE)
             )
             db.add(owner_user)
             db.commit()
+        OwnerService.invalidate_owner_cache()
             
         await update.message.reply_text(
             "👑 Добро пожаловать, владелец!\n\n"
@@ -19,7 +19,7 @@ from aiohttp import web
 from aiohttp.web import Request
 
 from config import settings
-from database import init_db
+from database import init_db, update_session_scope
 from handlers import registration, admin, manager, common, owner, manager_calendar
 from services.reminder_service import ReminderService
 from utils.scheduler import setup_scheduler
@@ -68,11 +68,11 @@ logging.getLogger('googleapiclient').setLevel(logging.WARNING)
 
 async def health_handler(request: Request):
     """Health check endpoint for deployment platforms."""
-    from utils.health_check import health_check
+    from utils.health_check import health_check_async
     import json
     
     try:
-        health_status = health_check()
+        health_status = await health_check_async()
         status_code = 200 if health_status['status'] == 'healthy' else 503
         return web.json_response(health_status, status=status_code)
     except Exception as e:
@@ -141,6 +141,13 @@ async def error_handler(update: Update, context):
         except Exception as e:
             logger.error(f"Failed to answer callback query for user {user_id}: {e}")
 
+class SessionScopedApplication(Application):
+    """Application, в котором каждый апдейт обрабатывается с одной сессией БД на все хендлеры"""
+    
+    async def process_update(self, update: object) -> None:
+        with update_session_scope():
+            await super().process_update(update)
+
 async def main():
     """Start the bot with full diagnostics."""
     logger.info("🚀 STARTING MEETING SCHEDULER BOT WITH FULL DIAGNOSTICS...")
@@ -150,8 +157,8 @@ async def main():
     debug_context("main", {"startup_stage": "init"}, 1)
     
     # Health check before startup
-    from utils.health_check import health_check
-    health = health_check()
+    from utils.health_check import health_check_async
+    health = await health_check_async()
     logger.info(f"🏥 HEALTH CHECK RESULT: {health}")
     if health['status'] != 'healthy':
         logger.error(f"❌ Health check failed: {health}")
@@ -194,7 +201,7 @@ async def main():
     
     # Create application
     logger.info("🤖 BUILDING TELEGRAM APPLICATION...")
-    application = Application.builder().token(settings.bot_token).build()
+    application = Application.builder().token(settings.bot_token).application_class(SessionScopedApplication).build()
     logger.info("🤖 ✅ APPLICATION BUILT")
     
     # Add error handler first
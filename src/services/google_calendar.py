@@ -174,8 +174,8 @@ class GoogleCalendarService:
         
         try:
             # Get busy times for the day
-            time_min = date.replace(hour=0, minute=0, second=0, microsecond=0).isoformat() + 'Z'
-            time_max = date.replace(hour=23, minute=59, second=59, microsecond=999999).isoformat() + 'Z'
+            time_min = f"{date:%Y-%m-%d}T00:00:00Z"
+            time_max = f"{date:%Y-%m-%d}T23:59:59Z"
             
             freebusy_query = {
                 'timeMin': time_min,
@@ -206,6 +206,20 @@ class GoogleCalendarService:
         end_hour = 18
         slot_duration = timedelta(minutes=duration_minutes)
         
+        # Parse busy periods once instead of re-parsing them for every candidate slot
+        busy_intervals = []
+        for busy_period in busy_times:
+            busy_start = datetime.fromisoformat(busy_period['start'].replace('Z', '+00:00'))
+            busy_end = datetime.fromisoformat(busy_period['end'].replace('Z', '+00:00'))
+            
+            # Convert to local timezone if needed
+            if busy_start.tzinfo:
+                busy_start = busy_start.replace(tzinfo=None)
+            if busy_end.tzinfo:
+                busy_end = busy_end.replace(tzinfo=None)
+            
+            busy_intervals.append((busy_start, busy_end))
+        
         available_slots = []
         current_time = date.replace(hour=start_hour, minute=0, second=0, microsecond=0)
         end_time = date.replace(hour=end_hour, minute=0, second=0, microsecond=0)
@@ -214,24 +228,13 @@ class GoogleCalendarService:
             slot_end = current_time + slot_duration
             
             # Check if this slot conflicts with any busy time
-            is_available = True
-            for busy_period in busy_times:
-                busy_start = datetime.fromisoformat(busy_period['start'].replace('Z', '+00:00'))
-                busy_end = datetime.fromisoformat(busy_period['end'].replace('Z', '+00:00'))
-                
-                # Convert to local timezone if needed
-                if busy_start.tzinfo:
-                    busy_start = busy_start.replace(tzinfo=None)
-                if busy_end.tzinfo:
-                    busy_end = busy_end.replace(tzinfo=None)
-                
-                # Check for overlap
-                if not (slot_end <= busy_start or current_time >= busy_end):
-                    is_available = False
-                    break
+            is_available = not any(
+                slot_end > busy_start and current_time < busy_end
+                for busy_start, busy_end in busy_intervals
+            )
             
             if is_available:
-                available_slots.append(current_time.strftime('%H:%M'))
+                available_slots.append(f"{current_time.hour:02d}:{current_time.minute:02d}")
             
             # Move to next slot (30 minutes intervals)
             current_time += timedelta(minutes=30)
@@ -204,6 +204,8 @@ class MeetingService:
             self.db.add(meeting)
             self.db.commit()
             self.db.refresh(meeting)
+            # Забронированный слот больше не должен показываться в меню доступных слотов
+            OwnerService.invalidate_available_slots_cache()
             
             # CRITICAL FIX: Notify all owners about the new meeting
             self._notify_owners_about_meeting(meeting, manager)
@@ -299,6 +301,7 @@ class MeetingService:
             # Update database regardless of calendar deletion success
             meeting.status = MeetingStatus.CANCELLED
             self.db.commit()
+            OwnerService.invalidate_available_slots_cache()
             
             logger.info(f"✅ Meeting {meeting_id} marked as cancelled in database")
             return True
@@ -167,6 +167,9 @@ class ManagerOAuthService:
                     # Save refreshed credentials
                     user.oauth_credentials = credentials.to_json()
                     db.commit()
+                    
+                    from services.owner_service import OwnerService
+                    OwnerService.invalidate_calendar_cache()
                 
                 return build('calendar', 'v3', credentials=credentials)
                 
@@ -237,6 +240,9 @@ class ManagerOAuthService:
                     user.email = email
                     user.calendar_connected = True
                     db.commit()
+                    
+                    from services.owner_service import OwnerService
+                    OwnerService.invalidate_calendar_cache()
                     logger.info(f"Saved credentials for manager {telegram_id}")
                 else:
                     logger.error(f"Manager {telegram_id} not found in database")
@@ -2,10 +2,17 @@
 Сервис управления владельцами бизнеса
 """
 import logging
+import threading
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import groupby
 from datetime import datetime, time, timedelta
-from typing import List, Dict, Optional
+from time import monotonic
+from typing import List, Dict, Optional, Set, Tuple
+import pytz
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import Row, and_, exists, lambda_stmt, select, func
 
 from database import get_db, User, UserRole, OwnerAvailability, OwnerBlockedTime
 from config import settings
@@ -22,12 +29,164 @@ TIME_SLOTS = [
     "14:00", "15:00", "16:00", "17:00", "18:00"
 ]
 
+# Предрассчитанные объекты time для слотов, чтобы не вызывать strptime в циклах
+TIME_SLOT_LUT = {slot: time(int(slot[:2]), int(slot[3:])) for slot in TIME_SLOTS}
+
+# Часовой пояс бизнеса разрешается один раз при импорте, а не на каждый запрос FreeBusy
+BUSINESS_TZ = pytz.timezone(getattr(settings, 'business_timezone', 'Europe/Moscow'))
+UTC = pytz.UTC
+BUSINESS_TZ_NAME = str(BUSINESS_TZ)
+FREEBUSY_TIME_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+# Пул для параллельных FreeBusy-запросов к календарям с разными OAuth клиентами
+_FREEBUSY_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="freebusy")
+
+# Кэш calendar_id -> OAuth credentials (JSON); сбрасывается при изменении подключения календаря
+_calendar_credentials_cache: Optional[Dict[str, str]] = None
+
+# Короткоживущий кэш редко меняющихся данных владельцев: ключ -> (истекает_в, значение)
+OWNER_CACHE_TTL = 60  # секунд
+_owner_cache: Dict[tuple, Tuple[float, tuple]] = {}
+
+def _owner_cache_get(key: tuple) -> Optional[tuple]:
+    """Значение из кэша владельцев или None, если его нет или TTL истек"""
+    entry = _owner_cache.get(key)
+    if entry is not None and entry[0] > monotonic():
+        return entry[1]
+    return None
+
+def _owner_cache_set(key: tuple, value: tuple) -> None:
+    _owner_cache[key] = (monotonic() + OWNER_CACHE_TTL, value)
+
+# Кэш результата get_available_slots_for_both_owners: (days_ahead, дата) -> (рассчитан_в, слоты).
+# Меню "Доступные слоты" открывают многократно, а расчет тяжелый (БД + FreeBusy)
+AVAILABLE_SLOTS_CACHE_TTL = 30  # секунд
+_available_slots_cache: Dict[tuple, Tuple[float, Dict[str, List[str]]]] = {}
+_available_slots_lock = threading.Lock()
+_available_slots_generation = 0  # растет при каждой инвалидации
+
+def _copy_slots(slots: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """Копия результата, чтобы вызывающий код не мог испортить закэшированные списки"""
+    return {day: list(day_slots) for day, day_slots in slots.items()}
+
+@contextmanager
+def _use_db(db: Optional[Session] = None):
+    """Использовать переданную сессию или открыть новую на время вызова"""
+    if db is not None:
+        yield db
+    else:
+        with get_db() as new_db:
+            yield new_db
+
+def _slot_key(slot_datetime: datetime) -> str:
+    """Строковый ключ слота "HH:MM" в формате колонки OwnerAvailability.time_slot"""
+    return f"{slot_datetime.hour:02d}:{slot_datetime.minute:02d}"
+
+def _day_slot_datetimes(day, time_slots) -> List[Tuple[str, datetime]]:
+    """Отсортированные пары (слот, datetime) на дату - все datetime дня строятся до цикла проверок"""
+    return [
+        (time_slot, datetime.combine(day, TIME_SLOT_LUT.get(time_slot) or datetime.strptime(time_slot, "%H:%M").time()))
+        for time_slot in sorted(time_slots)
+    ]
+
+def _blocked_overlap(start_date: datetime, end_date: datetime):
+    """Условие пересечения блокировки владельца с интервалом [start_date, end_date]"""
+    # Одно диапазонное условие вместо OR из трех случаев - используется индекс ix_obt_owner_range
+    return and_(OwnerBlockedTime.blocked_from <= end_date, OwnerBlockedTime.blocked_to >= start_date)
+
+def _load_owner_schedule(db: Session, owner_ids: List[int], range_start: datetime,
+                         range_end: datetime) -> Tuple[Dict[Tuple[int, int], Set[str]], Dict[int, List[Tuple[datetime, datetime]]]]:
+    """Двумя запросами загрузить активные слоты и блокировки владельцев на весь диапазон.
+    
+    Строки читаются порциями (yield_per) и сразу раскладываются по словарям.
+    """
+    slots_by_owner_day: Dict[Tuple[int, int], Set[str]] = {}
+    for owner_id, day_of_week, time_slot in db.query(
+        OwnerAvailability.owner_id, OwnerAvailability.day_of_week, OwnerAvailability.time_slot
+    ).filter(
+        OwnerAvailability.owner_id.in_(owner_ids),
+        OwnerAvailability.is_active == True
+    ).yield_per(200):
+        slots_by_owner_day.setdefault((owner_id, day_of_week), set()).add(time_slot)
+    
+    blocked_by_owner: Dict[int, List[Tuple[datetime, datetime]]] = {owner_id: [] for owner_id in owner_ids}
+    for owner_id, blocked_from, blocked_to in db.query(
+        OwnerBlockedTime.owner_id, OwnerBlockedTime.blocked_from, OwnerBlockedTime.blocked_to
+    ).filter(
+        OwnerBlockedTime.owner_id.in_(owner_ids),
+        _blocked_overlap(range_start, range_end)
+    ).yield_per(200):
+        blocked_by_owner[owner_id].append((blocked_from, blocked_to))
+    
+    for owner_id, intervals in blocked_by_owner.items():
+        blocked_by_owner[owner_id] = _merge_intervals(intervals)
+    
+    return slots_by_owner_day, blocked_by_owner
+
+def _merge_intervals(intervals) -> List[Tuple[datetime, datetime]]:
+    """Отсортировать интервалы и слить пересекающиеся/смежные.
+    
+    В результате и начала, и концы строго возрастают, поэтому для проверки пересечения
+    достаточно одного интервала, найденного bisect.
+    """
+    merged: List[Tuple[datetime, datetime]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+def _is_blocked(intervals: List[Tuple[datetime, datetime]], start: datetime, end: datetime) -> bool:
+    """Пересекается ли [start, end] с блокировкой из слитого списка (см. _merge_intervals)"""
+    # Последний интервал, начавшийся не позже end - единственный кандидат
+    idx = bisect_right(intervals, (end, datetime.max)) - 1
+    return idx >= 0 and intervals[idx][1] >= start
+
+def _is_calendar_slot_free(busy_intervals: Optional[List[Tuple[datetime, datetime]]],
+                           slot_datetime: datetime) -> Optional[bool]:
+    """Свободен ли часовой слот по слитым занятым интервалам FreeBusy (None - календарь недоступен)"""
+    if busy_intervals is None:
+        return None
+    
+    if slot_datetime.tzinfo is None:
+        slot_datetime = BUSINESS_TZ.localize(slot_datetime)
+    slot_end = slot_datetime + timedelta(hours=1)
+    
+    # Последний интервал, начавшийся до конца слота - единственный кандидат на пересечение
+    idx = bisect_left(busy_intervals, (slot_end,)) - 1
+    return idx < 0 or busy_intervals[idx][1] <= slot_datetime
+
+def _upsert_time_slots(db: Session, owner_id: int, day_of_week: int, time_slots: List[str]) -> None:
+    """INSERT ... ON CONFLICT (owner_id, day_of_week, time_slot) DO UPDATE SET is_active = TRUE WHERE NOT is_active"""
+    if db.get_bind().dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    
+    stmt = dialect_insert(OwnerAvailability.__table__).values([
+        {
+            "owner_id": owner_id,
+            "day_of_week": day_of_week,
+            "time_slot": time_slot,
+            "is_active": True
+        }
+        for time_slot in time_slots
+    ])
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["owner_id", "day_of_week", "time_slot"],
+        set_={"is_active": True, "updated_at": func.now()},
+        # Уже активные слоты не переписываются - меняются только новые и реактивируемые строки
+        where=(OwnerAvailability.__table__.c.is_active == False)
+    ))
+
 class OwnerService:
     
     @staticmethod
     def is_owner(user_id: int) -> bool:
         """Проверка, является ли пользователь владельцем"""
-        return user_id in settings.admin_ids_list
+        return user_id in settings.admin_ids_set
     
     @staticmethod
     def get_owner_by_telegram_id(telegram_id: int) -> Optional[User]:
@@ -38,10 +197,23 @@ class OwnerService:
             ).first()
     
     @staticmethod
-    def get_all_owners() -> List[User]:
-        """Получить всех владельцев"""
-        with get_db() as db:
-            return db.query(User).filter(User.role == UserRole.OWNER).all()
+    def get_all_owners() -> List[Row]:
+        """Получить всех владельцев (кэшируется на OWNER_CACHE_TTL секунд).
+        
+        Возвращаются строки (id, telegram_id, first_name, last_name, email, google_calendar_id,
+        oauth_credentials), а не ORM-объекты: кэш общий для всех апдейтов, а User привязан
+        к сессии, в которой загружен, и после ее коммита/закрытия обращение к его атрибутам
+        падает с DetachedInstanceError.
+        """
+        owners = _owner_cache_get(("owners",))
+        if owners is None:
+            with get_db() as db:
+                owners = tuple(db.query(
+                    User.id, User.telegram_id, User.first_name, User.last_name,
+                    User.email, User.google_calendar_id, User.oauth_credentials
+                ).filter(User.role == UserRole.OWNER).all())
+            _owner_cache_set(("owners",), owners)
+        return list(owners)
     
     @staticmethod
     def get_owner_availability(owner_id: int) -> List[OwnerAvailability]:
@@ -59,25 +231,25 @@ class OwnerService:
         """Установить временные слоты владельца на конкретный день"""
         try:
             with get_db() as db:
-                # Удаляем старые слоты для этого дня
+                keep = list(dict.fromkeys(time_slots))
+                
+                # Новые слоты вставляются, существующие - реактивируются одним UPSERT
+                if keep:
+                    _upsert_time_slots(db, owner_id, day_of_week, keep)
+                
+                # Слоты, которых нет в новом списке, деактивируются
                 db.query(OwnerAvailability).filter(
                     and_(
                         OwnerAvailability.owner_id == owner_id,
-                        OwnerAvailability.day_of_week == day_of_week
-                    )
-                ).delete()
-                
-                # Добавляем новые слоты
-                for time_slot in time_slots:
-                    availability = OwnerAvailability(
-                        owner_id=owner_id,
-                        day_of_week=day_of_week,
-                        time_slot=time_slot,
-                        is_active=True
+                        OwnerAvailability.day_of_week == day_of_week,
+                        OwnerAvailability.is_active == True,
+                        ~OwnerAvailability.time_slot.in_(keep)
                     )
-                    db.add(availability)
+                ).update({"is_active": False}, synchronize_session=False)
                 
                 db.commit()
+                _owner_cache.pop(("slots", owner_id, day_of_week), None)
+                OwnerService.invalidate_available_slots_cache()
                 
                 slots_str = ", ".join(time_slots)
                 logger.info(f"✅ Установлены временные слоты для владельца {owner_id}: {WEEKDAYS[day_of_week]} - {slots_str}")
@@ -92,29 +264,27 @@ class OwnerService:
         """Добавить один временной слот владельцу на конкретный день"""
         try:
             with get_db() as db:
-                # Проверяем, не существует ли уже такой слот
-                existing = db.query(OwnerAvailability).filter(
-                    and_(
-                        OwnerAvailability.owner_id == owner_id,
-                        OwnerAvailability.day_of_week == day_of_week,
-                        OwnerAvailability.time_slot == time_slot,
-                        OwnerAvailability.is_active == True
-                    )
-                ).first()
+                # Проверяем, не существует ли уже такой слот (SELECT EXISTS без загрузки объекта)
+                existing = db.query(
+                    db.query(OwnerAvailability.id).filter(
+                        and_(
+                            OwnerAvailability.owner_id == owner_id,
+                            OwnerAvailability.day_of_week == day_of_week,
+                            OwnerAvailability.time_slot == time_slot,
+                            OwnerAvailability.is_active == True
+                        )
+                    ).exists()
+                ).scalar()
                 
                 if existing:
                     logger.info(f"⚠️ Слот {time_slot} уже существует для {WEEKDAYS[day_of_week]}")
                     return False
                 
-                # Добавляем новый слот
-                availability = OwnerAvailability(
-                    owner_id=owner_id,
-                    day_of_week=day_of_week,
-                    time_slot=time_slot,
-                    is_active=True
-                )
-                db.add(availability)
+                # Добавляем новый слот (или реактивируем ранее отключенный)
+                _upsert_time_slots(db, owner_id, day_of_week, [time_slot])
                 db.commit()
+                _owner_cache.pop(("slots", owner_id, day_of_week), None)
+                OwnerService.invalidate_available_slots_cache()
                 
                 logger.info(f"✅ Добавлен слот для владельца {owner_id}: {WEEKDAYS[day_of_week]} {time_slot}")
                 return True
@@ -134,8 +304,10 @@ class OwnerService:
                         OwnerAvailability.day_of_week == day_of_week,
                         OwnerAvailability.time_slot == time_slot
                     )
-                ).delete()
+                ).delete(synchronize_session=False)
                 db.commit()
+                _owner_cache.pop(("slots", owner_id, day_of_week), None)
+                OwnerService.invalidate_available_slots_cache()
                 
                 if deleted:
                     logger.info(f"✅ Удален слот для владельца {owner_id}: {WEEKDAYS[day_of_week]} {time_slot}")
@@ -158,8 +330,10 @@ class OwnerService:
                         OwnerAvailability.owner_id == owner_id,
                         OwnerAvailability.day_of_week == day_of_week
                     )
-                ).delete()
+                ).delete(synchronize_session=False)
                 db.commit()
+                _owner_cache.pop(("slots", owner_id, day_of_week), None)
+                OwnerService.invalidate_available_slots_cache()
                 
                 logger.info(f"✅ Удалены все слоты для владельца {owner_id}: {WEEKDAYS[day_of_week]} (удалено: {deleted})")
                 return True
@@ -169,24 +343,57 @@ class OwnerService:
             return False
     
     @staticmethod
-    def get_owner_time_slots(owner_id: int, day_of_week: int) -> List[str]:
-        """Получить все временные слоты владельца на конкретный день"""
+    def get_owner_time_slots(owner_id: int, day_of_week: int, db: Optional[Session] = None) -> List[str]:
+        """Получить все временные слоты владельца на конкретный день (кэшируется на OWNER_CACHE_TTL секунд)"""
+        cache_key = ("slots", owner_id, day_of_week)
+        cached = _owner_cache_get(cache_key)
+        if cached is not None:
+            return list(cached)
+        
         try:
-            with get_db() as db:
-                slots = db.query(OwnerAvailability.time_slot).filter(
-                    and_(
+            with _use_db(db) as db:
+                # lambda_stmt: выражение строится и кэшируется один раз, owner_id/day_of_week идут bind-параметрами
+                time_slots = db.execute(lambda_stmt(
+                    lambda: select(OwnerAvailability.time_slot).where(
                         OwnerAvailability.owner_id == owner_id,
                         OwnerAvailability.day_of_week == day_of_week,
                         OwnerAvailability.is_active == True
-                    )
-                ).order_by(OwnerAvailability.time_slot).all()
-                
-                return [slot[0] for slot in slots]
+                    ).order_by(OwnerAvailability.time_slot)
+                )).scalars().all()
+            
+            _owner_cache_set(cache_key, tuple(time_slots))
+            return list(time_slots)
                 
         except Exception as e:
             logger.error(f"❌ Ошибка получения слотов: {e}")
             return []
     
+    @staticmethod
+    def get_owner_week_slots(owner_id: int) -> Dict[int, List[str]]:
+        """Получить активные слоты владельца на всю неделю одним запросом: день недели -> слоты"""
+        try:
+            with get_db() as db:
+                rows = db.execute(
+                    select(OwnerAvailability.day_of_week, OwnerAvailability.time_slot).where(
+                        OwnerAvailability.owner_id == owner_id,
+                        OwnerAvailability.is_active == True
+                    ).order_by(OwnerAvailability.day_of_week, OwnerAvailability.time_slot)
+                ).all()
+        except Exception as e:
+            logger.error(f"❌ Ошибка получения слотов: {e}")
+            return {}
+        
+        slots_by_day = {
+            day_of_week: [time_slot for _, time_slot in day_rows]
+            for day_of_week, day_rows in groupby(rows, key=lambda row: row[0])
+        }
+        
+        # Прогреваем кэш get_owner_time_slots: следующий шаг диалога обычно запрашивает один из этих дней
+        for day_of_week in range(len(WEEKDAYS)):
+            _owner_cache_set(("slots", owner_id, day_of_week), tuple(slots_by_day.get(day_of_week, ())))
+        
+        return slots_by_day
+    
     @staticmethod
     def block_owner_time(owner_id: int, blocked_from: datetime, blocked_to: datetime, reason: str = "") -> bool:
         """Заблокировать время владельца"""
@@ -200,6 +407,7 @@ class OwnerService:
                 )
                 db.add(blocked_time)
                 db.commit()
+                OwnerService.invalidate_available_slots_cache()
                 
                 logger.info(f"✅ Заблокировано время для владельца {owner_id}: {blocked_from} - {blocked_to}")
                 return True
@@ -209,17 +417,14 @@ class OwnerService:
             return False
     
     @staticmethod
-    def get_owner_blocked_times(owner_id: int, start_date: datetime, end_date: datetime) -> List[OwnerBlockedTime]:
-        """Получить заблокированное время владельца в диапазоне дат"""
-        with get_db() as db:
-            return db.query(OwnerBlockedTime).filter(
+    def get_owner_blocked_times(owner_id: int, start_date: datetime, end_date: datetime,
+                                db: Optional[Session] = None) -> List[Tuple[datetime, datetime]]:
+        """Получить заблокированное время владельца в диапазоне дат как пары (blocked_from, blocked_to)"""
+        with _use_db(db) as db:
+            return db.query(OwnerBlockedTime.blocked_from, OwnerBlockedTime.blocked_to).filter(
                 and_(
                     OwnerBlockedTime.owner_id == owner_id,
-                    or_(
-                        and_(OwnerBlockedTime.blocked_from >= start_date, OwnerBlockedTime.blocked_from <= end_date),
-                        and_(OwnerBlockedTime.blocked_to >= start_date, OwnerBlockedTime.blocked_to <= end_date),
-                        and_(OwnerBlockedTime.blocked_from <= start_date, OwnerBlockedTime.blocked_to >= end_date)
-                    )
+                    _blocked_overlap(start_date, end_date)
                 )
             ).all()
     
@@ -228,7 +433,12 @@ class OwnerService:
         """BULLETPROOF: Проверить, свободны ли все необходимые владельцы в указанное время"""
         from config import settings
         
-        owners = OwnerService.get_all_owners()
+        # Встречи назначаются только в рабочие дни (пн-пт) - выходные отсекаем без обращения к БД
+        if slot_datetime.weekday() >= 5:
+            return False
+        
+        # Один запрос: владельцы вместе с признаками "слот есть" и "время заблокировано"
+        owners = OwnerService._get_owners_availability_at_time(slot_datetime)
         if len(owners) < 1:
             logger.warning("⚠️ В системе нет владельцев")
             return False
@@ -240,70 +450,118 @@ class OwnerService:
         if actual_count == 1:
             if settings.allow_single_owner_mode:
                 logger.info(f"ℹ️ BULLETPROOF режим: 1 владелец из {expected_count} ожидаемых - {owners[0].first_name}")
-                return OwnerService.is_owner_available_at_time(owners[0].id, slot_datetime)
+                owners_to_check = 1
             else:
                 logger.warning(f"⚠️ Недостаточно владельцев: найден {actual_count}, ожидается {expected_count}, single-mode отключен")
                 return False
+        else:
+            # Проверяем нужное количество владельцев
+            owners_to_check = min(actual_count, expected_count, 2)  # Максимум 2 для совместимости
+            logger.info(f"ℹ️ Проверяем доступность {owners_to_check} владельцев из {actual_count} доступных")
         
-        # Проверяем нужное количество владельцев
-        owners_to_check = min(actual_count, expected_count, 2)  # Максимум 2 для совместимости
-        logger.info(f"ℹ️ Проверяем доступность {owners_to_check} владельцев из {actual_count} доступных")
+        return all(owner.has_slot and not owner.is_blocked for owner in owners[:owners_to_check])
+    
+    @staticmethod
+    def _get_owners_availability_at_time(slot_datetime: datetime) -> list:
+        """Все владельцы с доступностью в указанное время одним запросом.
         
-        for i in range(owners_to_check):
-            if not OwnerService.is_owner_available_at_time(owners[i].id, slot_datetime):
-                return False
+        Строки (id, first_name, has_slot, is_blocked) в порядке get_all_owners.
+        """
+        day_of_week = slot_datetime.weekday()
+        slot_time_str = _slot_key(slot_datetime)
+        slot_end = slot_datetime + timedelta(hours=1)  # Встреча длится 1 час
         
-        return True
+        has_slot = exists().where(
+            and_(
+                OwnerAvailability.owner_id == User.id,
+                OwnerAvailability.day_of_week == day_of_week,
+                OwnerAvailability.time_slot == slot_time_str,
+                OwnerAvailability.is_active == True
+            )
+        ).label("has_slot")
+        is_blocked = exists().where(
+            and_(
+                OwnerBlockedTime.owner_id == User.id,
+                _blocked_overlap(slot_datetime, slot_end)
+            )
+        ).label("is_blocked")
+        
+        with get_db() as db:
+            return db.query(User.id, User.first_name, has_slot, is_blocked).filter(
+                User.role == UserRole.OWNER
+            ).all()
     
     @staticmethod
-    def is_owner_available_at_time(owner_id: int, slot_datetime: datetime) -> bool:
+    def is_owner_available_at_time(owner_id: int, slot_datetime: datetime, db: Optional[Session] = None) -> bool:
         """Проверить, доступен ли владелец в конкретное время"""
         day_of_week = slot_datetime.weekday()  # 0=Monday, 6=Sunday
-        slot_time_str = slot_datetime.strftime("%H:%M")
+        slot_time_str = _slot_key(slot_datetime)
         
-        # Проверяем, есть ли у владельца такой временной слот
-        with get_db() as db:
-            time_slot = db.query(OwnerAvailability).filter(
-                and_(
+        slot_end = slot_datetime + timedelta(hours=1)  # Встреча длится 1 час
+        
+        # Выражения через lambda_stmt строятся один раз, значения идут bind-параметрами
+        # Если слоты дня уже в кэше, отсутствующий слот отсекается без запроса к БД
+        cached_slots = _owner_cache_get(("slots", owner_id, day_of_week))
+        if cached_slots is not None:
+            if slot_time_str not in cached_slots:
+                return False
+            stmt = lambda_stmt(lambda: select(~exists().where(
+                OwnerBlockedTime.owner_id == owner_id,
+                _blocked_overlap(slot_datetime, slot_end)
+            )))
+        else:
+            # Наличие слота и отсутствие блокировки проверяются одним запросом
+            stmt = lambda_stmt(lambda: select(and_(
+                exists().where(
                     OwnerAvailability.owner_id == owner_id,
                     OwnerAvailability.day_of_week == day_of_week,
                     OwnerAvailability.time_slot == slot_time_str,
                     OwnerAvailability.is_active == True
+                ),
+                ~exists().where(
+                    OwnerBlockedTime.owner_id == owner_id,
+                    _blocked_overlap(slot_datetime, slot_end)
                 )
-            ).first()
-            
-            if not time_slot:
-                return False
-            
-            # Проверяем заблокированное время
-            slot_end = slot_datetime + timedelta(hours=1)  # Встреча длится 1 час
-            blocked_times = OwnerService.get_owner_blocked_times(
-                owner_id, slot_datetime, slot_end
-            )
-            
-            if blocked_times:
-                return False
-            
-            return True
+            )))
+        
+        with _use_db(db) as db:
+            return bool(db.execute(stmt).scalar())
     
     @staticmethod
     def get_available_slots_for_both_owners(days_ahead: int = 14) -> Dict[str, List[str]]:
         """BULLETPROOF LOGIC: Get available slots for all active owners (supports 1+ owners)."""
-        available_slots = {}
+        # Ключ включает текущую дату, чтобы после полуночи не отдавать слоты вчерашнего окна
+        cache_key = (days_ahead, datetime.now().date())
+        with _available_slots_lock:
+            entry = _available_slots_cache.get(cache_key)
+            if entry is not None and monotonic() - entry[0] < AVAILABLE_SLOTS_CACHE_TTL:
+                return _copy_slots(entry[1])
+            generation = _available_slots_generation
         
-        from services.google_calendar import google_calendar_service
-        from database import get_db, User, UserRole
+        available_slots = OwnerService._calculate_available_slots(days_ahead)
         
-        # Get all active owners with their calendar IDs
+        with _available_slots_lock:
+            # Если расписание изменилось во время расчета, результат мог устареть - не кэшируем
+            if generation == _available_slots_generation:
+                _available_slots_cache[cache_key] = (monotonic(), available_slots)
+        return _copy_slots(available_slots)
+    
+    @staticmethod
+    def _calculate_available_slots(days_ahead: int) -> Dict[str, List[str]]:
+        """Расчет доступных слотов без кэша"""
+        # Одна сессия на весь расчет вместо новой сессии на каждый вложенный запрос
         with get_db() as db:
-            owners = db.query(User).filter(User.role == UserRole.OWNER).all()
+            # Get active owners with their calendar IDs (только нужные колонки, без ORM-объектов).
+            # Расчет использует не более двух владельцев, поэтому больше двух строк не читаем
+            owners = db.query(User.id, User.google_calendar_id, User.first_name).filter(
+                User.role == UserRole.OWNER
+            ).limit(2).all()
             
             if len(owners) == 0:
                 logger.warning("⚠️ В системе нет владельцев.")
                 return {}
             
             # BULLETPROOF: Используем настройки из конфигурации
-            from config import settings
             expected_count = settings.expected_owners_count
             actual_count = len(owners)
             
@@ -311,35 +569,63 @@ class OwnerService:
             if actual_count == 1:
                 if settings.allow_single_owner_mode:
                     logger.info(f"ℹ️ BULLETPROOF режим: 1 владелец из {expected_count} ожидаемых - {owners[0].first_name}")
-                    return OwnerService._get_single_owner_slots(owners[0], days_ahead)
+                    return OwnerService._get_single_owner_slots(owners[0], days_ahead, db)
                 else:
                     logger.warning(f"⚠️ Single-owner режим отключен, но найден только 1 владелец")
                     return {}
             
-            # Multi-owner mode - ищем пересечения слотов
-            owners_to_process = min(actual_count, 2)  # Максимум 2 для совместимости
-            logger.info(f"ℹ️ BULLETPROOF режим: обрабатываем {owners_to_process} владельцев из {actual_count}")
+            # Multi-owner mode - ищем пересечения слотов (максимум 2 для совместимости)
+            logger.info(f"ℹ️ BULLETPROOF режим: обрабатываем {actual_count} владельцев")
+            
+            # Берем первых двух владельцев для совместимости с существующей логикой
+            return OwnerService._get_two_owner_slots(owners[0], owners[1], days_ahead, db)
+    
+    @staticmethod
+    def _get_two_owner_slots(owner1: Row, owner2: Row, days_ahead: int, db: Session) -> Dict[str, List[str]]:
+        """Get common available slots for two owners (rows with id, google_calendar_id, first_name)."""
+        available_slots = {}
+        # Один снимок времени на весь расчет: от него считаются и дни, и окно запросов
+        now = datetime.now()
+        range_end = now + timedelta(days=days_ahead + 1)
+        
+        # Слоты и блокировки обоих владельцев на весь период - два запроса вместо запросов на каждый слот
+        slots_by_owner_day, blocked_by_owner = _load_owner_schedule(
+            db, [owner1.id, owner2.id], now, range_end
+        )
+        owner1_blocked = blocked_by_owner[owner1.id]
+        owner2_blocked = blocked_by_owner[owner2.id]
+        
+        # STEP 1: Общие слоты в локальной базе - пересечение множеств один раз на каждый рабочий день недели
+        empty = set()
+        common_by_weekday = {
+            day_of_week: slots_by_owner_day.get((owner1.id, day_of_week), empty)
+                         & slots_by_owner_day.get((owner2.id, day_of_week), empty)
+            for day_of_week in range(5)
+        }
         
-        # Берем первых двух владельцев для совместимости с существующей логикой
-        owner1, owner2 = owners[0], owners[1]
+        # Занятость Google Calendar обоих владельцев на весь период вместо FreeBusy-запроса на каждый слот
+        calendar_ids = [cal_id for cal_id in (owner1.google_calendar_id, owner2.google_calendar_id) if cal_id]
+        busy_by_calendar = {}
+        if calendar_ids and any(common_by_weekday.values()):
+            busy_by_calendar = OwnerService._fetch_freebusy_range(
+                calendar_ids, now, range_end, db
+            )
         
         # Генерируем слоты на указанное количество дней вперед
+        # День недели считается от базового, выходные отбрасываются до построения даты
+        today = now.date()
+        base_weekday = today.weekday()
         for day_offset in range(1, days_ahead + 1):
-            check_date = datetime.now() + timedelta(days=day_offset)
+            day_of_week = (base_weekday + day_offset) % 7  # 0=понедельник
             
             # Проверяем только рабочие дни (пн-пт)
-            if check_date.weekday() >= 5:  # Суббота=5, Воскресенье=6
+            if day_of_week >= 5:  # Суббота=5, Воскресенье=6
                 continue
             
-            date_str = check_date.strftime('%Y-%m-%d')
-            day_of_week = check_date.weekday()  # 0=понедельник
-            
-            # STEP 1: Найти общие слоты в локальной базе
-            owner1_slots = set(OwnerService.get_owner_time_slots(owner1.id, day_of_week))
-            owner2_slots = set(OwnerService.get_owner_time_slots(owner2.id, day_of_week))
+            check_date = today + timedelta(days=day_offset)
+            date_str = check_date.isoformat()
             
-            # Общие слоты - пересечение множеств
-            common_local_slots = owner1_slots.intersection(owner2_slots)
+            common_local_slots = common_by_weekday[day_of_week]
             
             if not common_local_slots:
                 continue  # Нет общих слотов в локальной базе
@@ -347,15 +633,12 @@ class OwnerService:
             # STEP 2: Проверить каждый общий слот на Google Calendar
             final_slots = []
             
-            for time_slot in sorted(common_local_slots):
-                slot_datetime = datetime.combine(
-                    check_date.date(),
-                    datetime.strptime(time_slot, "%H:%M").time()
-                )
+            for time_slot, slot_datetime in _day_slot_datetimes(check_date, common_local_slots):
                 
                 # Проверить блокировки владельцев
-                if (not OwnerService.is_owner_available_at_time(owner1.id, slot_datetime) or 
-                    not OwnerService.is_owner_available_at_time(owner2.id, slot_datetime)):
+                slot_end = slot_datetime + timedelta(hours=1)  # Встреча длится 1 час
+                if (_is_blocked(owner1_blocked, slot_datetime, slot_end) or
+                    _is_blocked(owner2_blocked, slot_datetime, slot_end)):
                     continue
                 
                 # STEP 3: Проверить Google Calendar обоих владельцев
@@ -364,31 +647,31 @@ class OwnerService:
                 
                 # Проверка календаря первого владельца
                 if owner1.google_calendar_id:
-                    is_free = OwnerService._check_google_calendar_slot(owner1.google_calendar_id, slot_datetime)
+                    is_free = _is_calendar_slot_free(busy_by_calendar.get(owner1.google_calendar_id), slot_datetime)
                     if is_free is False:
                         both_calendars_free = False
                     elif is_free is None:
                         calendar_errors.append(f"Овнер 1 ({owner1.first_name})")
                         both_calendars_free = False  # Консервативный подход
                 else:
-                    logger.warning(f"⚠️ Овнер {owner1.first_name} не подключил Google Calendar")
+                    logger.warning("⚠️ Овнер %s не подключил Google Calendar", owner1.first_name)
                     both_calendars_free = False
                 
                 # Проверка календаря второго владельца
                 if both_calendars_free and owner2.google_calendar_id:
-                    is_free = OwnerService._check_google_calendar_slot(owner2.google_calendar_id, slot_datetime)
+                    is_free = _is_calendar_slot_free(busy_by_calendar.get(owner2.google_calendar_id), slot_datetime)
                     if is_free is False:
                         both_calendars_free = False
                     elif is_free is None:
                         calendar_errors.append(f"Овнер 2 ({owner2.first_name})")
                         both_calendars_free = False  # Консервативный подход
                 elif both_calendars_free:
-                    logger.warning(f"⚠️ Овнер {owner2.first_name} не подключил Google Calendar")
+                    logger.warning("⚠️ Овнер %s не подключил Google Calendar", owner2.first_name)
                     both_calendars_free = False
                 
                 # Логирование ошибок
                 if calendar_errors:
-                    logger.error(f"❌ Google Calendar недоступен для: {', '.join(calendar_errors)} - слот {time_slot} блокируется")
+                    logger.error("❌ Google Calendar недоступен для: %s - слот %s блокируется", ', '.join(calendar_errors), time_slot)
                 
                 # Добавляем слот только если оба календаря свободны
                 if both_calendars_free:
@@ -400,23 +683,41 @@ class OwnerService:
         return available_slots
     
     @staticmethod
-    def _get_single_owner_slots(owner: User, days_ahead: int) -> Dict[str, List[str]]:
+    def _get_single_owner_slots(owner: Row, days_ahead: int, db: Optional[Session] = None) -> Dict[str, List[str]]:
         """Get available slots for a single owner (bulletproof mode for 1 owner)."""
         available_slots = {}
+        # Один снимок времени на весь расчет: от него считаются и дни, и окно запросов
+        now = datetime.now()
+        range_end = now + timedelta(days=days_ahead + 1)
+        
+        with _use_db(db) as db:
+            slots_by_owner_day, blocked_by_owner = _load_owner_schedule(
+                db, [owner.id], now, range_end
+            )
+            
+            busy_by_calendar = {}
+            if owner.google_calendar_id and slots_by_owner_day:
+                busy_by_calendar = OwnerService._fetch_freebusy_range(
+                    [owner.google_calendar_id], now, range_end, db
+                )
+        owner_blocked = blocked_by_owner[owner.id]
         
         # Генерируем слоты на указанное количество дней вперед
+        # День недели считается от базового, выходные отбрасываются до построения даты
+        today = now.date()
+        base_weekday = today.weekday()
         for day_offset in range(1, days_ahead + 1):
-            check_date = datetime.now() + timedelta(days=day_offset)
+            day_of_week = (base_weekday + day_offset) % 7  # 0=понедельник
             
             # Проверяем только рабочие дни (пн-пт)
-            if check_date.weekday() >= 5:  # Суббота=5, Воскресенье=6
+            if day_of_week >= 5:  # Суббота=5, Воскресенье=6
                 continue
             
-            date_str = check_date.strftime('%Y-%m-%d')
-            day_of_week = check_date.weekday()  # 0=понедельник
+            check_date = today + timedelta(days=day_offset)
+            date_str = check_date.isoformat()
             
             # Получаем локальные слоты владельца
-            owner_slots = OwnerService.get_owner_time_slots(owner.id, day_of_week)
+            owner_slots = slots_by_owner_day.get((owner.id, day_of_week))
             
             if not owner_slots:
                 continue  # Нет слотов в локальной базе
@@ -424,28 +725,24 @@ class OwnerService:
             # Проверяем каждый слот
             final_slots = []
             
-            for time_slot in sorted(owner_slots):
-                slot_datetime = datetime.combine(
-                    check_date.date(),
-                    datetime.strptime(time_slot, "%H:%M").time()
-                )
+            for time_slot, slot_datetime in _day_slot_datetimes(check_date, owner_slots):
                 
                 # Проверить блокировки владельца
-                if not OwnerService.is_owner_available_at_time(owner.id, slot_datetime):
+                if _is_blocked(owner_blocked, slot_datetime, slot_datetime + timedelta(hours=1)):
                     continue
                 
                 # Проверить Google Calendar владельца
                 calendar_free = True
                 
                 if owner.google_calendar_id:
-                    is_free = OwnerService._check_google_calendar_slot(owner.google_calendar_id, slot_datetime)
+                    is_free = _is_calendar_slot_free(busy_by_calendar.get(owner.google_calendar_id), slot_datetime)
                     if is_free is False:
                         calendar_free = False
                     elif is_free is None:
-                        logger.error(f"❌ Google Calendar недоступен для владельца {owner.first_name} - слот {time_slot} блокируется")
+                        logger.error("❌ Google Calendar недоступен для владельца %s - слот %s блокируется", owner.first_name, time_slot)
                         calendar_free = False  # Консервативный подход
                 else:
-                    logger.warning(f"⚠️ Владелец {owner.first_name} не подключил Google Calendar")
+                    logger.warning("⚠️ Владелец %s не подключил Google Calendar", owner.first_name)
                     # В режиме одного владельца разрешаем работу без календаря
                     calendar_free = True
                 
@@ -459,66 +756,192 @@ class OwnerService:
         return available_slots
     
     @staticmethod
-    def _check_google_calendar_slot(calendar_id: str, slot_datetime: datetime) -> Optional[bool]:
-        """Check if a specific slot is free in Google Calendar. Returns True/False/None(error)."""
+    def _get_calendar_credentials(calendar_id: str, db: Optional[Session] = None) -> Optional[str]:
+        """Получить OAuth credentials календаря из кэша (заполняется одним запросом)"""
+        global _calendar_credentials_cache
+        
+        cache = _calendar_credentials_cache
+        if cache is None:
+            with _use_db(db) as db:
+                rows = db.query(User.google_calendar_id, User.oauth_credentials).filter(
+                    User.google_calendar_id.isnot(None),
+                    User.oauth_credentials.isnot(None)
+                ).all()
+            
+            cache = {}
+            for row_calendar_id, credentials in rows:
+                cache.setdefault(row_calendar_id, credentials)
+            _calendar_credentials_cache = cache
+        
+        return cache.get(calendar_id)
+    
+    @staticmethod
+    def invalidate_calendar_cache():
+        """Сбросить кэш OAuth-календарей (после подключения, отключения или обновления токена)"""
+        global _calendar_credentials_cache
+        _calendar_credentials_cache = None
+        # Кэшированные владельцы содержат google_calendar_id и oauth_credentials
+        OwnerService.invalidate_owner_cache()
+    
+    @staticmethod
+    def invalidate_owner_cache():
+        """Сбросить кэш списка владельцев (после создания владельца или смены роли)"""
+        _owner_cache.pop(("owners",), None)
+        OwnerService.invalidate_available_slots_cache()
+    
+    @staticmethod
+    def invalidate_available_slots_cache():
+        """Сбросить кэш доступных слотов (после изменения расписания, блокировок или встреч)"""
+        global _available_slots_generation
+        with _available_slots_lock:
+            _available_slots_generation += 1
+            _available_slots_cache.clear()
+    
+    @staticmethod
+    def _get_calendar_api_service(calendar_id: str, db: Optional[Session] = None):
+        """Google Calendar API клиент для календаря: OAuth владельца или Service Account.
+        
+        Returns (service, is_oauth); service равен None, если API недоступен.
+        """
         from services.google_calendar import google_calendar_service
         from services.oauth_service import ManagerOAuthService
-        from database import get_db, User
         import json
         
         # First, check if this is an OAuth calendar
-        oauth_service = None
-        with get_db() as db:
-            user = db.query(User).filter(
-                User.google_calendar_id == calendar_id,
-                User.oauth_credentials.isnot(None)
-            ).first()
+        credentials_json = OwnerService._get_calendar_credentials(calendar_id, db)
+        
+        if credentials_json:
+            try:
+                # Use OAuth service for OAuth-connected calendars
+                oauth_credentials = json.loads(credentials_json)
+                oauth_manager = ManagerOAuthService()
+                oauth_service = oauth_manager.create_calendar_service_from_credentials(oauth_credentials)
+                
+                if oauth_service:
+                    logger.info("✅ Using OAuth service for calendar check: %s", calendar_id)
+                    return oauth_service, True
+            except Exception as e:
+                logger.error(f"Failed to create OAuth service: {e}")
+        
+        # Fall back to Service Account
+        return google_calendar_service._service, False
+    
+    @staticmethod
+    def _fetch_freebusy_range(calendar_ids: List[str], time_min: datetime, time_max: datetime,
+                              db: Optional[Session] = None) -> Dict[str, Optional[List[Tuple[datetime, datetime]]]]:
+        """Занятые интервалы нескольких календарей за весь период одним FreeBusy-запросом на API клиент.
+        
+        Календари Service Account запрашиваются вместе, OAuth-календари - каждый своим клиентом.
+        Returns calendar_id -> слитый отсортированный список (start, end) или None при ошибке.
+        """
+        if time_min.tzinfo is None:
+            time_min = BUSINESS_TZ.localize(time_min)
+        if time_max.tzinfo is None:
+            time_max = BUSINESS_TZ.localize(time_max)
+        
+        result: Dict[str, Optional[List[Tuple[datetime, datetime]]]] = {}
+        shared_calendar_ids = []
+        batches = []
+        
+        for calendar_id in dict.fromkeys(calendar_ids):
+            service, is_oauth = OwnerService._get_calendar_api_service(calendar_id, db)
+            if not service:
+                logger.error(f"No service available for calendar {calendar_id}")
+                result[calendar_id] = None
+            elif is_oauth:
+                batches.append((service, [calendar_id]))
+            else:
+                shared_service = service
+                shared_calendar_ids.append(calendar_id)
+        
+        if shared_calendar_ids:
+            batches.append((shared_service, shared_calendar_ids))
+        
+        time_min_str = time_min.astimezone(UTC).strftime(FREEBUSY_TIME_FORMAT)
+        time_max_str = time_max.astimezone(UTC).strftime(FREEBUSY_TIME_FORMAT)
+        
+        # У каждого пакета свой API клиент, поэтому несколько пакетов запрашиваются параллельно
+        if len(batches) > 1:
+            batch_results = _FREEBUSY_POOL.map(
+                lambda batch: OwnerService._query_freebusy_batch(batch[0], batch[1], time_min_str, time_max_str),
+                batches
+            )
+        else:
+            batch_results = [
+                OwnerService._query_freebusy_batch(service, batch_ids, time_min_str, time_max_str)
+                for service, batch_ids in batches
+            ]
+        
+        for batch_result in batch_results:
+            result.update(batch_result)
+        
+        return result
+    
+    @staticmethod
+    def _query_freebusy_batch(service, batch_ids: List[str], time_min: str,
+                              time_max: str) -> Dict[str, Optional[List[Tuple[datetime, datetime]]]]:
+        """Один FreeBusy-запрос для календарей одного API клиента"""
+        freebusy_query = {
+            'timeMin': time_min,
+            'timeMax': time_max,
+            'items': [{'id': calendar_id} for calendar_id in batch_ids],
+            'timeZone': BUSINESS_TZ_NAME
+        }
+        logger.info("🔍 FreeBusy range query for %s: %s to %s", ', '.join(batch_ids), time_min, time_max)
+        
+        try:
+            calendars = service.freebusy().query(body=freebusy_query).execute().get('calendars', {})
+        except Exception as e:
+            logger.error(f"Error checking Google Calendar {', '.join(batch_ids)}: {e}")
+            return {calendar_id: None for calendar_id in batch_ids}
+        
+        result: Dict[str, Optional[List[Tuple[datetime, datetime]]]] = {}
+        for calendar_id in batch_ids:
+            calendar_data = calendars.get(calendar_id, {})
+            errors = calendar_data.get('errors', [])
+            if errors:
+                logger.error("❌ Calendar API errors for %s: %s", calendar_id, errors)
+                result[calendar_id] = None
+                continue
             
-            if user and user.oauth_credentials:
-                try:
-                    # Use OAuth service for OAuth-connected calendars
-                    oauth_credentials = json.loads(user.oauth_credentials)
-                    oauth_manager = ManagerOAuthService()
-                    oauth_service = oauth_manager.create_calendar_service_from_credentials(oauth_credentials)
-                    
-                    if oauth_service:
-                        logger.info(f"✅ Using OAuth service for calendar check: {calendar_id}")
-                except Exception as e:
-                    logger.error(f"Failed to create OAuth service: {e}")
-                    oauth_service = None
-        
-        # Use OAuth service if available, otherwise fall back to Service Account
-        service_to_use = oauth_service if oauth_service else google_calendar_service._service
+            busy_times = calendar_data.get('busy', [])
+            logger.info("📊 FreeBusy result for %s: %d busy periods found", calendar_id, len(busy_times))
+            result[calendar_id] = _merge_intervals(
+                (datetime.fromisoformat(busy['start']), datetime.fromisoformat(busy['end']))
+                for busy in busy_times
+            )
+        
+        return result
+    
+    @staticmethod
+    def _check_google_calendar_slot(calendar_id: str, slot_datetime: datetime) -> Optional[bool]:
+        """Check if a specific slot is free in Google Calendar. Returns True/False/None(error)."""
+        service_to_use, _ = OwnerService._get_calendar_api_service(calendar_id)
         
         if not service_to_use:
             logger.error(f"No service available for calendar {calendar_id}")
             return None  # Calendar service unavailable
         
         try:
-            import pytz
-            from config import settings
-            
-            # Определяем часовой пояс
-            timezone = pytz.timezone(settings.business_timezone if hasattr(settings, 'business_timezone') else 'Europe/Moscow')
-            
             # Если datetime не содержит timezone info, добавляем его
             if slot_datetime.tzinfo is None:
-                slot_datetime = timezone.localize(slot_datetime)
+                slot_datetime = BUSINESS_TZ.localize(slot_datetime)
             
             slot_end = slot_datetime + timedelta(hours=1)
             
             # Конвертируем в UTC для API
-            time_min = slot_datetime.astimezone(pytz.UTC).isoformat().replace('+00:00', 'Z')
-            time_max = slot_end.astimezone(pytz.UTC).isoformat().replace('+00:00', 'Z')
+            time_min = slot_datetime.astimezone(UTC).strftime(FREEBUSY_TIME_FORMAT)
+            time_max = slot_end.astimezone(UTC).strftime(FREEBUSY_TIME_FORMAT)
             
-            logger.info(f"🔍 Checking calendar {calendar_id} for slot {slot_datetime.strftime('%Y-%m-%d %H:%M %Z')}")
-            logger.info(f"🔍 FreeBusy query: {time_min} to {time_max}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("🔍 Checking calendar %s for slot %s", calendar_id, slot_datetime.strftime('%Y-%m-%d %H:%M %Z'))
+            logger.info("🔍 FreeBusy query: %s to %s", time_min, time_max)
             
             freebusy_query = {
                 'timeMin': time_min,
                 'timeMax': time_max,
                 'items': [{'id': calendar_id}],
-                'timeZone': str(timezone)  # Указываем timezone для правильной интерпретации
+                'timeZone': BUSINESS_TZ_NAME  # Указываем timezone для правильной интерпретации
             }
             
             freebusy_result = service_to_use.freebusy().query(body=freebusy_query).execute()
@@ -529,23 +952,23 @@ class OwnerService:
             errors = calendar_data.get('errors', [])
             
             if errors:
-                logger.error(f"❌ Calendar API errors for {calendar_id}: {errors}")
+                logger.error("❌ Calendar API errors for %s: %s", calendar_id, errors)
                 return None
             
-            logger.info(f"📊 FreeBusy result for {calendar_id}: {len(busy_times)} busy periods found")
+            logger.info("📊 FreeBusy result for %s: %d busy periods found", calendar_id, len(busy_times))
             
-            # Логируем каждый занятый период
-            for busy_period in busy_times:
-                busy_start = busy_period.get('start', 'unknown')
-                busy_end = busy_period.get('end', 'unknown')
-                logger.info(f"  📌 Busy: {busy_start} to {busy_end}")
+            # Логируем каждый занятый период (только в режиме отладки)
+            if logger.isEnabledFor(logging.DEBUG):
+                for busy_period in busy_times:
+                    logger.debug("  📌 Busy: %s to %s", busy_period.get('start', 'unknown'), busy_period.get('end', 'unknown'))
             
             is_free = len(busy_times) == 0
             
             if is_free:
-                logger.info(f"✅ Slot {slot_datetime.strftime('%Y-%m-%d %H:%M %Z')} is FREE in calendar {calendar_id}")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("✅ Slot %s is FREE in calendar %s", slot_datetime.strftime('%Y-%m-%d %H:%M %Z'), calendar_id)
             else:
-                logger.warning(f"❌ Slot {slot_datetime.strftime('%Y-%m-%d %H:%M %Z')} is BUSY in calendar {calendar_id}")
+                logger.warning("❌ Slot %s is BUSY in calendar %s", slot_datetime.strftime('%Y-%m-%d %H:%M %Z'), calendar_id)
             
             return is_free  # True if no busy times
             
@@ -556,17 +979,16 @@ class OwnerService:
     @staticmethod
     def format_availability_text(owner_id: int) -> str:
         """Форматировать текст доступности владельца по слотам"""
-        text = "📅 Ваши временные слоты:\n\n"
-        has_slots = False
+        parts = ["📅 Ваши временные слоты:\n\n"]
+        
+        slots_by_day = OwnerService.get_owner_week_slots(owner_id)
         
         for day_index, day_name in enumerate(WEEKDAYS):
-            slots = OwnerService.get_owner_time_slots(owner_id, day_index)
+            slots = slots_by_day.get(day_index)
             if slots:
-                has_slots = True
-                slots_text = ", ".join(slots)
-                text += f"• <b>{day_name}</b>: {slots_text}\n"
+                parts.append(f"• <b>{day_name}</b>: {', '.join(slots)}\n")
         
-        if not has_slots:
+        if len(parts) == 1:
             return "❌ Временные слоты не настроены\n\n💡 Добавьте слоты для начала приема встреч"
         
-        return text
\ No newline at end of file
+        return "".join(parts)
\ No newline at end of file
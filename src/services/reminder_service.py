@@ -1,34 +1,79 @@
 from datetime import datetime, timedelta
 import logging
-from typing import List
+from collections import deque
+from typing import List, Optional
 import asyncio
 from telegram import Bot
-from sqlalchemy import and_
+from telegram.error import RetryAfter
+from sqlalchemy import and_, func, insert, select, update
+from sqlalchemy.orm import joinedload
 
-from database import get_db, User, Meeting, Reminder, UserStatus, MeetingStatus
+from database import get_db, User, UserRole, Meeting, Reminder, UserStatus, MeetingStatus
 from config import settings
 
 logger = logging.getLogger(__name__)
 
+# Telegram ограничивает бота ~30 сообщениями в секунду: за одно окно отправляется одна пачка.
+# Размер пачки адаптивный: растет на 1 после успешной пачки, уменьшается вдвое при RetryAfter
+REMINDER_BATCH_SIZE = 25  # стартовый размер пачки
+REMINDER_MAX_BATCH_SIZE = 30
+REMINDER_BATCH_DELAY = 1.0  # длительность окна, секунд
+REMINDER_MAX_RETRIES = 3  # сколько раз напоминание возвращается в очередь после RetryAfter
+
+# Тексты напоминаний собираются один раз при импорте, а не на каждое отправленное напоминание
+SCHEDULE_MESSAGES = {
+    'schedule_meeting_7d': (
+        "🔔 Напоминание\n\n"
+        "Прошло 7 дней с последней встречи.\n"
+        "Пожалуйста, назначьте следующую встречу.\n\n"
+        "Нажмите /schedule для просмотра доступных слотов."
+    ),
+    'schedule_meeting_3d': (
+        "⚠️ Важное напоминание\n\n"
+        "Осталось 3 дня до крайнего срока назначения встречи.\n"
+        "Пожалуйста, обязательно назначьте встречу!\n\n"
+        "/schedule - Посмотреть доступные слоты"
+    ),
+    'schedule_meeting_1d': (
+        "🚨 Критичное напоминание\n\n"
+        "Остался 1 день до крайнего срока!\n"
+        "Если вы не назначите встречу, администраторы будут уведомлены.\n\n"
+        "/schedule - Назначить встречу СЕЙЧАС"
+    ),
+}
+
+MEETING_1H_TEMPLATE = (
+    "🔔 Напоминание > 2AB@5G5\n\n"
+    "Через 1 час у вас встреча!\n\n"
+    "=� {date_str} 2 {time_str}\n"
+    "< Google Meet: {meet_link}\n\n"
+    "Подготовьтесь к созвону!"
+)
+
 class ReminderService:
     def __init__(self):
         self.timezone = settings.timezone
     
     async def schedule_meeting_reminders(self, meeting_id: int):
         """Schedule all reminders for a meeting."""
+        # Синхронная работа с БД выполняется в пуле потоков, не блокируя обработку других апдейтов
+        await asyncio.get_running_loop().run_in_executor(None, self._schedule_meeting_reminders, meeting_id)
+    
+    @staticmethod
+    def _schedule_meeting_reminders(meeting_id: int):
+        """Schedule all reminders for a meeting (blocking, runs in an executor thread)."""
         with get_db() as db:
             meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
             if not meeting:
                 return
             
-            user = meeting.manager
             meeting_time = meeting.scheduled_time
             
             # Schedule 1 hour before meeting reminder
             reminder_time = meeting_time - timedelta(hours=1)
             if reminder_time > datetime.now():
                 reminder = Reminder(
-                    user_id=user.id,
+                    user_id=meeting.manager_id,
                     meeting_id=meeting.id,
                     reminder_type='meeting_1h',
                     scheduled_for=reminder_time
@@ -39,6 +84,13 @@ class ReminderService:
     
     async def schedule_next_meeting_reminders(self, user_id: int, last_meeting_date: datetime):
         """Schedule reminders for next meeting (2 weeks after last one)."""
+        await asyncio.get_running_loop().run_in_executor(
+            None, self._schedule_next_meeting_reminders, user_id, last_meeting_date
+        )
+    
+    @staticmethod
+    def _schedule_next_meeting_reminders(user_id: int, last_meeting_date: datetime):
+        """Schedule reminders for next meeting (blocking, runs in an executor thread)."""
         next_meeting_due = last_meeting_date + timedelta(days=14)
         
         with get_db() as db:
@@ -49,43 +101,115 @@ class ReminderService:
                     Reminder.meeting_id.is_(None),
                     Reminder.sent == False
                 )
-            ).delete()
+            ).delete(synchronize_session=False)
             
             # Schedule reminders at 7, 3, and 1 days before due date
-            for days_before in settings.reminder_intervals:
-                reminder_time = next_meeting_due - timedelta(days=days_before)
-                
-                if reminder_time > datetime.now():
-                    reminder = Reminder(
-                        user_id=user_id,
-                        reminder_type=f'schedule_meeting_{days_before}d',
-                        scheduled_for=reminder_time
-                    )
-                    db.add(reminder)
+            now = datetime.now()
+            rows = [
+                {
+                    "user_id": user_id,
+                    "reminder_type": f'schedule_meeting_{days_before}d',
+                    "scheduled_for": next_meeting_due - timedelta(days=days_before)
+                }
+                for days_before in settings.reminder_intervals
+                if next_meeting_due - timedelta(days=days_before) > now
+            ]
+            
+            # Все напоминания вставляются одним executemany без создания ORM-объектов
+            if rows:
+                db.execute(insert(Reminder), rows)
             
             db.commit()
     
     async def process_pending_reminders(self, bot: Bot):
         """Process all pending reminders."""
+        now = datetime.now()
         with get_db() as db:
-            now = datetime.now()
-            pending_reminders = db.query(Reminder).filter(
+            # user и meeting загружаются тем же запросом, без отдельного SELECT на каждое напоминание
+            pending_reminders = db.query(Reminder).options(
+                joinedload(Reminder.user),
+                joinedload(Reminder.meeting)
+            ).filter(
                 and_(
                     Reminder.sent == False,
                     Reminder.scheduled_for <= now
                 )
             ).all()
+            # Отсоединяем объекты: соединение с БД не удерживается на время отправки в Telegram
+            db.expunge_all()
+        
+        loop = asyncio.get_running_loop()
+        pending_updates = []
+        queue = deque(pending_reminders)
+        retries = {}
+        batch_size = REMINDER_BATCH_SIZE
+        
+        async def send_one(reminder: Reminder):
+            """Возвращает True (отправлено), RetryAfter (упёрлись в лимит) или None (ошибка)"""
+            try:
+                await self._send_reminder(bot, reminder)
+                return True
+            except RetryAfter as e:
+                return e
+            except Exception as e:
+                logger.error(f"Failed to send reminder {reminder.id}: {e}")
+                return None
+        
+        # Отправляем параллельно внутри пачки, одна пачка на окно REMINDER_BATCH_DELAY
+        while queue:
+            window_started = loop.time()
+            batch = [queue.popleft() for _ in range(min(batch_size, len(queue)))]
+            results = await asyncio.gather(*(send_one(r) for r in batch))
+            
+            sent_ids = [r.id for r, result in zip(batch, results) if result is True]
+            throttled = [(r, result) for r, result in zip(batch, results) if isinstance(result, RetryAfter)]
             
-            for reminder in pending_reminders:
-                try:
-                    await self._send_reminder(bot, reminder)
-                    reminder.sent = True
-                    reminder.sent_at = now
-                except Exception as e:
-                    logger.error(f"Failed to send reminder {reminder.id}: {e}")
+            # Пачка отмечается одним UPDATE в потоке, пока отправляется следующая пачка
+            if sent_ids:
+                pending_updates.append(loop.run_in_executor(None, self._mark_reminders_sent, sent_ids, now))
             
+            if throttled:
+                batch_size = max(1, batch_size // 2)
+                delay = max(float(result.retry_after) for _, result in throttled)
+                for reminder, _ in reversed(throttled):
+                    retries[reminder.id] = retries.get(reminder.id, 0) + 1
+                    if retries[reminder.id] > REMINDER_MAX_RETRIES:
+                        logger.error(f"Failed to send reminder {reminder.id}: rate limited {REMINDER_MAX_RETRIES} times")
+                    else:
+                        queue.appendleft(reminder)
+                logger.warning(f"⚠️ Telegram rate limit hit, batch size reduced to {batch_size}, waiting {delay}s")
+            else:
+                batch_size = min(batch_size + 1, REMINDER_MAX_BATCH_SIZE)
+                delay = max(0.0, REMINDER_BATCH_DELAY - (loop.time() - window_started))
+            
+            if queue:
+                await asyncio.sleep(delay)
+        
+        if pending_updates:
+            await asyncio.gather(*pending_updates)
+    
+    @staticmethod
+    def _mark_reminders_sent(reminder_ids: List[int], sent_at: datetime):
+        """Mark reminders as sent with a single UPDATE (blocking, runs in an executor thread)."""
+        with get_db() as db:
+            db.execute(
+                update(Reminder)
+                .where(Reminder.id.in_(reminder_ids))
+                .values(sent=True, sent_at=sent_at)
+            )
             db.commit()
     
+    @staticmethod
+    def get_next_reminder_time(after: datetime) -> Optional[datetime]:
+        """Due time of the earliest unsent reminder later than `after`, or None (blocking, uses ix_reminders_pending)."""
+        with get_db() as db:
+            return db.execute(
+                select(func.min(Reminder.scheduled_for)).where(
+                    Reminder.sent == False,
+                    Reminder.scheduled_for > after
+                )
+            ).scalar()
+    
     async def _send_reminder(self, bot: Bot, reminder: Reminder):
         """Send a specific reminder."""
         user = reminder.user
@@ -95,43 +219,16 @@ class ReminderService:
             return
         
         if reminder.reminder_type.startswith('schedule_meeting'):
-            # Reminder to schedule next meeting
-            days = reminder.reminder_type.split('_')[-1].replace('d', '')
-            
-            if days == '7':
-                message = (
-                    f"🔔 Напоминание\n\n"
-                    f"Прошло 7 дней с последней встречи.\n"
-                    f"Пожалуйста, назначьте следующую встречу.\n\n"
-                    f"Нажмите /schedule для просмотра доступных слотов."
-                )
-            elif days == '3':
-                message = (
-                    f"⚠️ Важное напоминание\n\n"
-                    f"Осталось 3 дня до крайнего срока назначения встречи.\n"
-                    f"Пожалуйста, обязательно назначьте встречу!\n\n"
-                    f"/schedule - Посмотреть доступные слоты"
-                )
-            else:  # 1 day
-                message = (
-                    f"🚨 Критичное напоминание\n\n"
-                    f"Остался 1 день до крайнего срока!\n"
-                    f"Если вы не назначите встречу, администраторы будут уведомлены.\n\n"
-                    f"/schedule - Назначить встречу СЕЙЧАС"
-                )
+            # Reminder to schedule next meeting (unknown intervals get the most urgent text)
+            message = SCHEDULE_MESSAGES.get(reminder.reminder_type, SCHEDULE_MESSAGES['schedule_meeting_1d'])
         
         elif reminder.reminder_type == 'meeting_1h':
             # 1 hour before meeting reminder
             meeting = reminder.meeting
-            time_str = meeting.scheduled_time.strftime('%H:%M')
-            date_str = meeting.scheduled_time.strftime('%d.%m.%Y')
-            
-            message = (
-                f"🔔 Напоминание > 2AB@5G5\n\n"
-                f"Через 1 час у вас встреча!\n\n"
-                f"=� {date_str} 2 {time_str}\n"
-                f"< Google Meet: {meeting.google_meet_link}\n\n"
-                f"Подготовьтесь к созвону!"
+            message = MEETING_1H_TEMPLATE.format(
+                date_str=meeting.scheduled_time.strftime('%d.%m.%Y'),
+                time_str=meeting.scheduled_time.strftime('%H:%M'),
+                meet_link=meeting.google_meet_link
             )
         
         await bot.send_message(
@@ -145,14 +242,21 @@ class ReminderService:
             # Find users who should have had a meeting by now
             cutoff_date = datetime.now() - timedelta(days=17)  # 14 + 3 grace days
             
-            overdue_users = db.query(User).filter(
+            # Анти-join: руководители без запланированных встреч после cutoff_date
+            recent_meetings = db.query(Meeting.manager_id).filter(
+                and_(
+                    Meeting.scheduled_time > cutoff_date,
+                    Meeting.status == MeetingStatus.SCHEDULED
+                )
+            ).subquery()
+            
+            overdue_users = db.query(User).outerjoin(
+                recent_meetings, recent_meetings.c.manager_id == User.id
+            ).filter(
                 and_(
                     User.status == UserStatus.ACTIVE,
-                    User.role.in_([UserRole.MANAGER]),
-                    ~User.meetings.any(
-                        Meeting.scheduled_time > cutoff_date,
-                        Meeting.status == MeetingStatus.SCHEDULED
-                    )
+                    User.role == UserRole.MANAGER,
+                    recent_meetings.c.manager_id.is_(None)
                 )
             ).all()
             
@@ -169,11 +273,13 @@ class ReminderService:
         
         message += "\nПожалуйста, свяжитесь с ними для назначения встречи."
         
-        for admin_id in settings.admin_ids_list:
-            try:
-                await bot.send_message(
-                    chat_id=admin_id,
-                    text=message
-                )
-            except Exception as e:
-                logger.error(f"Failed to notify admin {admin_id}: {e}")
\ No newline at end of file
+        # Одно и то же сообщение всем администраторам - отправляем параллельно
+        admin_ids = settings.admin_ids_list
+        results = await asyncio.gather(
+            *(bot.send_message(chat_id=admin_id, text=message) for admin_id in admin_ids),
+            return_exceptions=True
+        )
+        
+        for admin_id, result in zip(admin_ids, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to notify admin {admin_id}: {result}")
\ No newline at end of file
@@ -1,11 +1,48 @@
+from time import monotonic
+from sqlalchemy import Row, lambda_stmt, select
 from sqlalchemy.orm import Session
-from database import User, UserRole, UserStatus
-from typing import List, Optional
+from database import get_db, User, UserRole, UserStatus
+from typing import Dict, List, Optional, Tuple
+
+# Access data (id, role, status) by telegram_id: read on every decorated update, changes rarely.
+# Entries expire after USER_CACHE_TTL seconds and are dropped explicitly whenever role/status changes.
+USER_CACHE_TTL = 60  # seconds
+USER_CACHE_MAXSIZE = 10_000
+_user_access_cache: Dict[int, Tuple[float, Row]] = {}
 
 class UserService:
     def __init__(self, db: Session):
         self.db = db
     
+    @staticmethod
+    def get_user_access(telegram_id: int) -> Optional[Row]:
+        """Get (id, role, status) of a user by Telegram ID, cached for USER_CACHE_TTL seconds."""
+        entry = _user_access_cache.get(telegram_id)
+        if entry is not None and entry[0] > monotonic():
+            return entry[1]
+        
+        with get_db() as db:
+            # lambda_stmt: the statement is built and compiled once, telegram_id is bound per call
+            access = db.execute(lambda_stmt(
+                lambda: select(User.id, User.role, User.status).where(User.telegram_id == telegram_id).limit(1)
+            )).first()
+        
+        # Unknown users are not cached: they may register with their very next message
+        if access is not None:
+            if len(_user_access_cache) >= USER_CACHE_MAXSIZE:
+                # Dicts keep insertion order - drop the oldest entry
+                _user_access_cache.pop(next(iter(_user_access_cache)), None)
+            _user_access_cache[telegram_id] = (monotonic() + USER_CACHE_TTL, access)
+        return access
+    
+    @staticmethod
+    def invalidate_user_cache(telegram_id: Optional[int] = None):
+        """Drop cached access data for one user (or for everyone) after its role/status changed."""
+        if telegram_id is None:
+            _user_access_cache.clear()
+        else:
+            _user_access_cache.pop(telegram_id, None)
+    
     def get_user_by_telegram_id(self, telegram_id: int) -> Optional[User]:
         """Get user by Telegram ID."""
         return self.db.query(User).filter(User.telegram_id == telegram_id).first()
@@ -24,6 +61,7 @@ class UserService:
         self.db.add(user)
         self.db.commit()
         self.db.refresh(user)
+        UserService.invalidate_user_cache(telegram_id)
         return user
     
     def approve_user(self, user_id: int) -> bool:
@@ -32,6 +70,7 @@ class UserService:
         if user and user.role == UserRole.PENDING:
             user.role = UserRole.MANAGER
             self.db.commit()
+            UserService.invalidate_user_cache(user.telegram_id)
             return True
         return False
     
@@ -52,6 +91,7 @@ class UserService:
         if user:
             user.status = status
             self.db.commit()
+            UserService.invalidate_user_cache(user.telegram_id)
             return True
         return False
     
@@ -59,7 +99,9 @@ class UserService:
         """Delete a user."""
         user = self.db.query(User).filter(User.id == user_id).first()
         if user:
+            telegram_id = user.telegram_id
             self.db.delete(user)
             self.db.commit()
+            UserService.invalidate_user_cache(telegram_id)
             return True
         return False
\ No newline at end of file
@@ -2,17 +2,21 @@
 Bulletproof database health monitoring and recovery system.
 """
 import logging
+import threading
 import time
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError, OperationalError
 
-from database import engine, get_db, User
+from database import engine
 from config import settings
 
 logger = logging.getLogger(__name__)
 
+# Health check makes 5 round trips; repeated status requests reuse the last result
+HEALTH_CACHE_TTL = 10  # seconds
+
 class DatabaseHealthMonitor:
     """Monitor database health and provide recovery mechanisms."""
     
@@ -20,9 +24,25 @@ class DatabaseHealthMonitor:
         self.last_health_check = None
         self.consecutive_failures = 0
         self.max_failures = 3
+        self._cached_status: Optional[Dict[str, Any]] = None
+        self._cached_at = 0.0
+        self._cache_lock = threading.Lock()
+        
+    def check_database_health(self, force: bool = False) -> Dict[str, Any]:
+        """Comprehensive database health check (cached for HEALTH_CACHE_TTL seconds unless force)."""
+        with self._cache_lock:
+            if not force and self._cached_status is not None and time.monotonic() - self._cached_at < HEALTH_CACHE_TTL:
+                return self._cached_status
+        
+        health_status = self._run_health_checks()
         
-    def check_database_health(self) -> Dict[str, Any]:
-        """Comprehensive database health check."""
+        with self._cache_lock:
+            self._cached_status = health_status
+            self._cached_at = time.monotonic()
+        return health_status
+    
+    def _run_health_checks(self) -> Dict[str, Any]:
+        """Run all health checks against the database."""
         health_status = {
             'status': 'healthy',
             'checks': {},
@@ -31,20 +51,7 @@ class DatabaseHealthMonitor:
         }
         
         try:
-            # Test 1: Basic connection
-            health_status['checks']['connection'] = self._test_connection()
-            
-            # Test 2: Table existence
-            health_status['checks']['tables'] = self._test_tables()
-            
-            # Test 3: Read operation
-            health_status['checks']['read'] = self._test_read_operation()
-            
-            # Test 4: Write operation (non-destructive)
-            health_status['checks']['write'] = self._test_write_operation()
-            
-            # Test 5: Migration status
-            health_status['checks']['migration'] = self._test_migration_status()
+            health_status['checks'] = self._run_checks_on_one_connection()
             
             # Overall status
             failed_checks = [k for k, v in health_status['checks'].items() if not v['success']]
@@ -63,114 +70,146 @@ class DatabaseHealthMonitor:
             
         return health_status
     
-    def _test_connection(self) -> Dict[str, Any]:
+    def _run_checks_on_one_connection(self) -> Dict[str, Dict[str, Any]]:
+        """Run all sub-checks over a single pooled connection instead of one connection per check."""
+        try:
+            conn = engine.connect()
+        except Exception as e:
+            # Without a connection every check fails, as it did when each check connected on its own
+            failure = {
+                'success': False,
+                'message': f'Connection failed: {str(e)}',
+                'error': str(e)
+            }
+            return {name: dict(failure) for name in ('connection', 'tables', 'read', 'write', 'migration')}
+        
+        with conn:
+            # Test 4: Write operation (non-destructive) - needs a real transaction,
+            # so it runs first, while the connection is still in its default isolation level
+            write_result = self._test_write_operation(conn)
+            
+            # The remaining checks only read: autocommit skips the BEGIN/ROLLBACK round trips around them
+            # (the pool restores the isolation level when the connection is returned)
+            conn.execution_options(isolation_level="AUTOCOMMIT")
+            return {
+                # Test 1: Basic connection
+                'connection': self._test_connection(conn),
+                # Test 2: Table existence
+                'tables': self._test_tables(conn),
+                # Test 3: Read operation
+                'read': self._test_read_operation(conn),
+                'write': write_result,
+                # Test 5: Migration status
+                'migration': self._test_migration_status(conn),
+            }
+    
+    def _test_connection(self, conn) -> Dict[str, Any]:
         """Test basic database connection."""
         try:
-            with engine.connect() as conn:
-                result = conn.execute(text("SELECT 1")).scalar()
-                return {
-                    'success': result == 1,
-                    'message': 'Connection successful',
-                    'response_time_ms': 0  # Could add timing
-                }
+            result = conn.execute(text("SELECT 1")).scalar()
+            return {
+                'success': result == 1,
+                'message': 'Connection successful',
+                'response_time_ms': 0  # Could add timing
+            }
         except Exception as e:
+            conn.rollback()
             return {
                 'success': False,
                 'message': f'Connection failed: {str(e)}',
                 'error': str(e)
             }
     
-    def _test_tables(self) -> Dict[str, Any]:
+    def _test_tables(self, conn) -> Dict[str, Any]:
         """Test that required tables exist."""
         try:
-            with engine.connect() as conn:
-                if settings.database_url.startswith('postgresql'):
-                    result = conn.execute(text("""
-                        SELECT tablename FROM pg_tables 
-                        WHERE schemaname = 'public' AND tablename = 'users'
-                    """))
-                else:
-                    result = conn.execute(text("""
-                        SELECT name FROM sqlite_master 
-                        WHERE type='table' AND name='users'
-                    """))
-                
-                tables_exist = len(result.fetchall()) > 0
-                return {
-                    'success': tables_exist,
-                    'message': 'Required tables exist' if tables_exist else 'Users table missing'
-                }
+            if settings.database_url.startswith('postgresql'):
+                result = conn.execute(text("""
+                    SELECT tablename FROM pg_tables 
+                    WHERE schemaname = 'public' AND tablename = 'users'
+                """))
+            else:
+                result = conn.execute(text("""
+                    SELECT name FROM sqlite_master 
+                    WHERE type='table' AND name='users'
+                """))
+            
+            tables_exist = len(result.fetchall()) > 0
+            return {
+                'success': tables_exist,
+                'message': 'Required tables exist' if tables_exist else 'Users table missing'
+            }
         except Exception as e:
+            conn.rollback()
             return {
                 'success': False,
                 'message': f'Table check failed: {str(e)}',
                 'error': str(e)
             }
     
-    def _test_read_operation(self) -> Dict[str, Any]:
+    def _test_read_operation(self, conn) -> Dict[str, Any]:
         """Test read operations."""
         try:
-            with get_db() as db:
-                count = db.query(User).count()
-                return {
-                    'success': True,
-                    'message': f'Read successful, {count} users in database',
-                    'user_count': count
-                }
+            # A probe only needs a successful read; an exact COUNT(*) scans the whole table
+            if settings.database_url.startswith('postgresql'):
+                estimate = conn.execute(text(
+                    "SELECT reltuples::bigint FROM pg_class WHERE relname = 'users'"
+                )).scalar()
+                conn.execute(text("SELECT 1 FROM users LIMIT 1")).fetchall()
+                message = f'Read successful, ~{estimate} users in database'
+            else:
+                conn.execute(text("SELECT 1 FROM users LIMIT 1")).fetchall()
+                estimate = None
+                message = 'Read successful'
+            return {
+                'success': True,
+                'message': message,
+                'user_count_estimate': estimate
+            }
         except Exception as e:
+            conn.rollback()
             return {
                 'success': False,
                 'message': f'Read operation failed: {str(e)}',
                 'error': str(e)
             }
     
-    def _test_write_operation(self) -> Dict[str, Any]:
+    def _test_write_operation(self, conn) -> Dict[str, Any]:
         """Test write operations (non-destructive)."""
         try:
-            with engine.connect() as conn:
-                # Test with a simple transaction that we rollback
-                trans = conn.begin()
-                try:
-                    conn.execute(text("SELECT COUNT(*) FROM users"))
-                    trans.rollback()  # Don't commit, just test write capability
-                    return {
-                        'success': True,
-                        'message': 'Write test successful'
-                    }
-                except Exception as e:
-                    trans.rollback()
-                    raise e
+            # Test with a simple transaction that we rollback
+            trans = conn.begin()
+            try:
+                conn.execute(text("SELECT 1 FROM users LIMIT 1")).fetchall()
+                trans.rollback()  # Don't commit, just test write capability
+                return {
+                    'success': True,
+                    'message': 'Write test successful'
+                }
+            except Exception as e:
+                trans.rollback()
+                raise e
         except Exception as e:
+            conn.rollback()
             return {
                 'success': False,
                 'message': f'Write operation failed: {str(e)}',
                 'error': str(e)
             }
     
-    def _test_migration_status(self) -> Dict[str, Any]:
+    def _test_migration_status(self, conn) -> Dict[str, Any]:
         """Check if all required fields exist."""
         try:
-            with engine.connect() as conn:
-                # Check for new fields that should exist after migrations
-                if settings.database_url.startswith('postgresql'):
-                    result = conn.execute(text("""
-                        SELECT column_name FROM information_schema.columns 
-                        WHERE table_name = 'users' 
-                        AND column_name IN ('google_calendar_id', 'oauth_credentials', 'calendar_connected')
-                    """))
-                else:
-                    result = conn.execute(text("PRAGMA table_info(users)"))
-                    columns = [row[1] for row in result.fetchall()]
-                    required_fields = {'google_calendar_id', 'oauth_credentials', 'calendar_connected'}
-                    missing_fields = required_fields - set(columns)
-                    
-                    return {
-                        'success': len(missing_fields) == 0,
-                        'message': f'Migration status: {"Complete" if len(missing_fields) == 0 else "Incomplete"}',
-                        'missing_fields': list(missing_fields) if missing_fields else []
-                    }
-                
-                columns = [row[0] for row in result.fetchall()]
+            # Check for new fields that should exist after migrations
+            if settings.database_url.startswith('postgresql'):
+                result = conn.execute(text("""
+                    SELECT column_name FROM information_schema.columns 
+                    WHERE table_name = 'users' 
+                    AND column_name IN ('google_calendar_id', 'oauth_credentials', 'calendar_connected')
+                """))
+            else:
+                result = conn.execute(text("PRAGMA table_info(users)"))
+                columns = [row[1] for row in result.fetchall()]
                 required_fields = {'google_calendar_id', 'oauth_credentials', 'calendar_connected'}
                 missing_fields = required_fields - set(columns)
                 
@@ -179,7 +218,18 @@ class DatabaseHealthMonitor:
                     'message': f'Migration status: {"Complete" if len(missing_fields) == 0 else "Incomplete"}',
                     'missing_fields': list(missing_fields) if missing_fields else []
                 }
+            
+            columns = [row[0] for row in result.fetchall()]
+            required_fields = {'google_calendar_id', 'oauth_credentials', 'calendar_connected'}
+            missing_fields = required_fields - set(columns)
+            
+            return {
+                'success': len(missing_fields) == 0,
+                'message': f'Migration status: {"Complete" if len(missing_fields) == 0 else "Incomplete"}',
+                'missing_fields': list(missing_fields) if missing_fields else []
+            }
         except Exception as e:
+            conn.rollback()
             return {
                 'success': False,
                 'message': f'Migration check failed: {str(e)}',
@@ -195,8 +245,8 @@ class DatabaseHealthMonitor:
             from database import init_db
             init_db()
             
-            # Run health check to verify recovery
-            health = self.check_database_health()
+            # Run health check to verify recovery (bypass the cached pre-recovery result)
+            health = self.check_database_health(force=True)
             success = health['status'] in ['healthy', 'degraded']
             
             if success:
@@ -1,33 +1,56 @@
 import functools
 import logging
+from typing import Optional
+from sqlalchemy import Row
+from sqlalchemy.exc import IntegrityError
 from telegram import Update
 from telegram.ext import ContextTypes
 
 from database import get_db, User, UserRole
 from config import settings
+from services.owner_service import OwnerService
+from services.user_service import UserService
 
 logger = logging.getLogger(__name__)
 
+# Ответы при отказе в доступе
+_ERR_NOT_REGISTERED = "❌ Вы не зарегистрированы в системе. Используйте /start для регистрации."
+_ERR_PENDING = "⏳ Ваша заявка ожидает одобрения администратором."
+_ERR_NO_RIGHTS = "❌ У вас нет прав для выполнения этой команды."
+_ERR_NO_MANAGER_RIGHTS = "❌ У вас нет прав руководителя для выполнения этой команды."
+_ERR_NO_ADMIN_RIGHTS = "❌ У вас нет административных прав."
+_ERR_OWNER_INIT = "❌ Ошибка инициализации владельца. Попробуйте команду /start."
+
+def _is_human_update(update: Update) -> bool:
+    """Апдейты без пользователя (посты каналов и т.п.) и от ботов не проверяются - без запроса к БД"""
+    user = update.effective_user
+    return user is not None and not user.is_bot
+
+async def _reply(update: Update, text: str) -> None:
+    """Ответить на сообщение апдейта, если оно есть (у части апдейтов сообщения нет)"""
+    if update.effective_message is not None:
+        await update.effective_message.reply_text(text)
+
+def _load_user(update: Update) -> Optional[Row]:
+    """Строка (id, role, status) пользователя апдейта из кэша UserService"""
+    return UserService.get_user_access(update.effective_user.id)
+
 def require_registration(func):
     """Декоратор для проверки регистрации пользователя"""
     @functools.wraps(func)
     async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
-        user_id = update.effective_user.id
+        if not _is_human_update(update):
+            return
         
-        with get_db() as db:
-            user = db.query(User).filter(User.telegram_id == user_id).first()
-            
-            if not user:
-                await update.effective_message.reply_text(
-                    "❌ Вы не зарегистрированы в системе. Используйте /start для регистрации."
-                )
-                return
-            
-            if user.role == UserRole.PENDING:
-                await update.effective_message.reply_text(
-                    "⏳ Ваша заявка ожидает одобрения администратором."
-                )
-                return
+        user = _load_user(update)
+        
+        if not user:
+            await _reply(update, _ERR_NOT_REGISTERED)
+            return
+        
+        if user.role == UserRole.PENDING:
+            await _reply(update, _ERR_PENDING)
+            return
         
         return await func(update, context, *args, **kwargs)
     return wrapper
@@ -36,24 +59,25 @@ def require_owner(func):
     """Декоратор для проверки прав владельца"""
     @functools.wraps(func)
     async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
+        if not _is_human_update(update):
+            return
+        
         user_id = update.effective_user.id
         
         # Проверяем, что пользователь в списке владельцев
-        if user_id not in settings.admin_ids_list:
-            await update.effective_message.reply_text(
-                "❌ У вас нет прав для выполнения этой команды."
-            )
+        if user_id not in settings.admin_ids_set:
+            await _reply(update, _ERR_NO_RIGHTS)
             return
         
         # Проверяем/создаем пользователя-владельца если его нет в БД
-        with get_db() as db:
-            user = db.query(User).filter(User.telegram_id == user_id).first()
-            
-            if not user:
-                # Автоматически создаем владельца если его нет в БД
-                logger.info(f"Creating owner user for ID {user_id}")
-                try:
-                    from database import Department
+        user = _load_user(update)
+        
+        if not user:
+            # Автоматически создаем владельца если его нет в БД
+            logger.info(f"Creating owner user for ID {user_id}")
+            try:
+                from database import Department
+                with get_db() as db:
                     owner_user = User(
                         telegram_id=user_id,
                         telegram_username=update.effective_user.username,
@@ -63,57 +87,69 @@ def require_owner(func):
                         role=UserRole.OWNER
                     )
                     db.add(owner_user)
-                    db.commit()
-                    logger.info(f"Successfully created owner user for ID {user_id}")
-                except Exception as e:
-                    logger.error(f"Failed to create owner user: {e}")
-                    await update.effective_message.reply_text(
-                        "❌ Ошибка инициализации владельца. Попробуйте команду /start."
-                    )
-                    return
-            elif user.role != UserRole.OWNER:
-                # Обновляем роль до владельца, если пользователь в админском списке
-                logger.info(f"Updating user {user_id} role to OWNER")
-                user.role = UserRole.OWNER
+                    try:
+                        db.commit()
+                    except IntegrityError:
+                        # Параллельный апдейт этого же владельца уже создал запись - используем ее
+                        db.rollback()
+                        logger.info(f"Owner user for ID {user_id} was created concurrently")
+                OwnerService.invalidate_owner_cache()
+                logger.info(f"Successfully created owner user for ID {user_id}")
+            except Exception as e:
+                logger.error(f"Failed to create owner user: {e}")
+                await _reply(update, _ERR_OWNER_INIT)
+                return
+        elif user.role != UserRole.OWNER:
+            # Обновляем роль до владельца, если пользователь в админском списке
+            logger.info(f"Updating user {user_id} role to OWNER")
+            with get_db() as db:
+                db.query(User).filter(User.telegram_id == user_id).update(
+                    {"role": UserRole.OWNER}, synchronize_session=False
+                )
                 db.commit()
+            UserService.invalidate_user_cache(user_id)
+            OwnerService.invalidate_owner_cache()
         
         return await func(update, context, *args, **kwargs)
     return wrapper
 
-def require_manager(func):
-    """Декоратор для проверки прав руководителя"""
-    @functools.wraps(func)
-    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
-        user_id = update.effective_user.id
-        
-        with get_db() as db:
-            user = db.query(User).filter(User.telegram_id == user_id).first()
+def require_roles(*roles: UserRole, denied_message: str = _ERR_NO_RIGHTS):
+    """Декоратор: пользователь зарегистрирован и его роль входит в roles - одна проверка вместо стека декораторов"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
+            if not _is_human_update(update):
+                return
+            
+            user = _load_user(update)
             
             if not user:
-                await update.effective_message.reply_text(
-                    "❌ Вы не зарегистрированы в системе. Используйте /start для регистрации."
-                )
+                await _reply(update, _ERR_NOT_REGISTERED)
                 return
             
-            if user.role not in [UserRole.MANAGER, UserRole.OWNER]:
-                await update.effective_message.reply_text(
-                    "❌ У вас нет прав руководителя для выполнения этой команды."
-                )
+            if user.role not in roles:
+                await _reply(update, denied_message)
                 return
-        
-        return await func(update, context, *args, **kwargs)
-    return wrapper
+            
+            return await func(update, context, *args, **kwargs)
+        return wrapper
+    return decorator
+
+# Декоратор для проверки прав руководителя
+require_manager = require_roles(
+    UserRole.MANAGER, UserRole.OWNER,
+    denied_message=_ERR_NO_MANAGER_RIGHTS
+)
 
 def require_admin(func):
     """Декоратор для проверки прав администратора (владельца)"""
     @functools.wraps(func)
     async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
-        user_id = update.effective_user.id
+        if not _is_human_update(update):
+            return
         
-        if user_id not in settings.admin_ids_list:
-            await update.effective_message.reply_text(
-                "❌ У вас нет административных прав."
-            )
+        if update.effective_user.id not in settings.admin_ids_set:
+            await _reply(update, _ERR_NO_ADMIN_RIGHTS)
             return
         
         return await func(update, context, *args, **kwargs)
@@ -124,17 +160,19 @@ def log_user_action(action_name: str):
     def decorator(func):
         @functools.wraps(func)
         async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
-            user_id = update.effective_user.id
-            username = update.effective_user.username or "Unknown"
+            effective_user = update.effective_user
+            user_id = effective_user.id if effective_user else None
+            username = (effective_user.username if effective_user else None) or "Unknown"
             
-            logger.info(f"👤 User {user_id} (@{username}) performed action: {action_name}")
+            # %-форматирование ленивое: строка собирается, только если INFO включен
+            logger.info("👤 User %s (@%s) performed action: %s", user_id, username, action_name)
             
             try:
                 result = await func(update, context, *args, **kwargs)
-                logger.info(f"✅ Action {action_name} completed successfully for user {user_id}")
+                logger.info("✅ Action %s completed successfully for user %s", action_name, user_id)
                 return result
             except Exception as e:
-                logger.error(f"❌ Action {action_name} failed for user {user_id}: {e}")
+                logger.error("❌ Action %s failed for user %s: %s", action_name, user_id, e)
                 raise
         
         return wrapper
@@ -1,20 +1,37 @@
 """Simple health check utility for small team deployment."""
+import asyncio
 import logging
+import threading
+import time
 from datetime import datetime
-from sqlalchemy import text
+from sqlalchemy import literal, select
 from database import engine
 from config import settings
 
 logger = logging.getLogger(__name__)
 
-def check_database_connection():
-    """Check if database is accessible."""
+DB_CHECK_CACHE_TTL = 5  # seconds; liveness probes poll far more often than this
+_db_check_cache = None  # (checked_at, result)
+_db_check_lock = threading.Lock()
+_PING_STATEMENT = select(literal(1))  # built once, compiled once via the statement cache
+
+def check_database_connection(force=False):
+    """Check if database is accessible (cached for DB_CHECK_CACHE_TTL seconds unless force)."""
+    global _db_check_cache
+    with _db_check_lock:
+        if not force and _db_check_cache is not None and time.monotonic() - _db_check_cache[0] < DB_CHECK_CACHE_TTL:
+            return _db_check_cache[1]
+    
     try:
         with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
-        return True, "Database OK"
+            conn.execute(_PING_STATEMENT).scalar()
+        result = True, "Database OK"
     except Exception as e:
-        return False, f"Database error: {str(e)[:100]}"
+        result = False, f"Database error: {str(e)[:100]}"
+    
+    with _db_check_lock:
+        _db_check_cache = (time.monotonic(), result)
+    return result
 
 def check_config():
     """Check if required config is present."""
@@ -32,12 +49,12 @@ def check_config():
     except Exception as e:
         return False, f"Config error: {str(e)[:100]}"
 
-def health_check():
-    """Run all health checks."""
+def _build_report(database, config):
+    """Assemble the health report from individual check results."""
     checks = {
         'timestamp': datetime.now().isoformat(),
-        'database': check_database_connection(),
-        'config': check_config()
+        'database': database,
+        'config': config
     }
     
     all_ok = all(check[0] for check in checks.values() if isinstance(check, tuple))
@@ -48,6 +65,20 @@ def health_check():
                   for k, v in checks.items()}
     }
 
+def health_check():
+    """Run all health checks."""
+    return _build_report(check_database_connection(), check_config())
+
+async def health_check_async():
+    """Run all health checks without blocking the event loop.
+    
+    The database round-trip runs in a worker thread; the config check is
+    pure Python and runs inline while the database check is in flight.
+    """
+    database_task = asyncio.create_task(asyncio.to_thread(check_database_connection))
+    config = check_config()
+    return _build_report(await database_task, config)
+
 if __name__ == '__main__':
     import json
     print(json.dumps(health_check(), indent=2))
\ No newline at end of file
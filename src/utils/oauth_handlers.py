@@ -1,11 +1,23 @@
 """
 OAuth callback handlers for web endpoints
 """
+import asyncio
 import logging
 from aiohttp import web as aio_web
 
 logger = logging.getLogger(__name__)
 
+# Static response bodies are encoded once at import
+_OAUTH_ERROR_HTML = "🙁 Ошибка подключения календаря. Попробуйте еще раз.".encode('utf-8')
+_BAD_PARAMS_HTML = "❌ Неверные параметры OAuth".encode('utf-8')
+_SUCCESS_HTML = "✅ <h1>Календарь успешно подключен!</h1><p>Возвращайтесь в Телеграм бот для планирования встреч.</p>".encode('utf-8')
+_FAILURE_HTML_TEMPLATE = "❌ <h1>Ошибка подключения</h1><p>{error}</p>"
+_SERVER_ERROR_HTML = "❌ Внутренняя ошибка сервера".encode('utf-8')
+
+def _html_response(body: bytes, status: int = 200):
+    """Build a UTF-8 HTML response from a pre-encoded body."""
+    return aio_web.Response(body=body, content_type='text/html', charset='utf-8', status=status)
+
 async def oauth_callback_handler(request, application):
     """Handle OAuth callback for manager calendar integration."""
     try:
@@ -18,21 +30,13 @@ async def oauth_callback_handler(request, application):
         
         if error:
             logger.error(f"OAuth error: {error}")
-            return aio_web.Response(
-                text="🙁 Ошибка подключения календаря. Попробуйте еще раз.",
-                content_type='text/html; charset=utf-8',
-                status=400
-            )
+            return _html_response(_OAUTH_ERROR_HTML, status=400)
         
         if not code or not state:
-            return aio_web.Response(
-                text="❌ Неверные параметры OAuth",
-                content_type='text/html; charset=utf-8',
-                status=400
-            )
+            return _html_response(_BAD_PARAMS_HTML, status=400)
         
-        # Handle OAuth callback
-        result = oauth_service.handle_oauth_callback(code, state)
+        # Token exchange and calendar lookup are blocking Google API calls: run them in a thread
+        result = await asyncio.to_thread(oauth_service.handle_oauth_callback, code, state)
         
         if result['success']:
             # Notify user via Telegram
@@ -51,25 +55,12 @@ async def oauth_callback_handler(request, application):
             except Exception as e:
                 logger.error(f"Failed to notify user about successful OAuth: {e}")
             
-            return aio_web.Response(
-                text="✅ <h1>Календарь успешно подключен!</h1><p>Возвращайтесь в Телеграм бот для планирования встреч.</p>",
-                content_type='text/html',
-                charset='utf-8'
-            )
+            return _html_response(_SUCCESS_HTML)
         else:
             logger.error(f"OAuth callback failed: {result.get('error')}")
-            return aio_web.Response(
-                text=f"❌ <h1>Ошибка подключения</h1><p>{result.get('error', 'Неизвестная ошибка')}</p>",
-                content_type='text/html',
-                charset='utf-8',
-                status=400
-            )
+            error_text = result.get('error', 'Неизвестная ошибка')
+            return _html_response(_FAILURE_HTML_TEMPLATE.format(error=error_text).encode('utf-8'), status=400)
         
     except Exception as e:
         logger.error(f"OAuth callback handler error: {e}")
-        return aio_web.Response(
-            text="❌ Внутренняя ошибка сервера",
-            content_type='text/html',
-            charset='utf-8',
-            status=500
-        )
\ No newline at end of file
+        return _html_response(_SERVER_ERROR_HTML, status=500)
\ No newline at end of file
@@ -2,6 +2,7 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.executors.asyncio import AsyncIOExecutor
 from datetime import datetime, timedelta
+import asyncio
 import logging
 import pytz
 
@@ -10,8 +11,16 @@ from services.reminder_service import ReminderService
 
 logger = logging.getLogger(__name__)
 
+# ReminderService is stateless: one instance serves every scheduled tick
+_reminder_service = ReminderService()
+
+REMINDER_SWEEP_MINUTES = 15
+_scheduler = None  # set by setup_scheduler, used to plan one-shot reminder runs
+_reminder_run_lock = asyncio.Lock()  # the sweep and a one-shot run must not send the same reminders twice
+
 def setup_scheduler(application):
     """Setup APScheduler for reminders."""
+    global _scheduler
     
     # Configure scheduler
     jobstores = {
@@ -36,7 +45,9 @@ def setup_scheduler(application):
     scheduler.add_job(
         func=process_reminders,
         trigger="interval",
-        minutes=15,  # Check every 15 minutes for 7 people
+        minutes=REMINDER_SWEEP_MINUTES,  # Safety-net sweep; due reminders are also run on time (see _schedule_next_reminder_run)
+        # First sweep right at startup: it re-plans the one-shot run lost with the in-memory job store
+        next_run_time=datetime.now(pytz.timezone(settings.timezone)),
         args=[application],
         id='reminder_processor',
         replace_existing=True
@@ -52,22 +63,51 @@ def setup_scheduler(application):
         replace_existing=True
     )
     
+    _scheduler = scheduler
     return scheduler
 
 async def process_reminders(application):
     """Process pending reminders."""
+    async with _reminder_run_lock:
+        try:
+            await _reminder_service.process_pending_reminders(application.bot)
+            logger.info("Processed pending reminders")
+        except Exception as e:
+            logger.error(f"Error processing reminders: {e}")
+        await _schedule_next_reminder_run(application)
+
+async def _schedule_next_reminder_run(application):
+    """Plan a one-shot run at the next reminder's due time if it comes before the next sweep."""
+    if _scheduler is None:
+        return
     try:
-        reminder_service = ReminderService()
-        await reminder_service.process_pending_reminders(application.bot)
-        logger.info("Processed pending reminders")
+        loop = asyncio.get_running_loop()
+        # Reminders already due but unsent (failed sends) are left to the sweep
+        now = datetime.now()
+        next_time = await loop.run_in_executor(None, _reminder_service.get_next_reminder_time, now)
+        if next_time is None:
+            return
+        
+        # scheduled_for is naive server-local time: convert via the delay, not the wall clock
+        delay = next_time - now
+        if delay >= timedelta(minutes=REMINDER_SWEEP_MINUTES):
+            return
+        
+        _scheduler.add_job(
+            func=process_reminders,
+            trigger="date",
+            run_date=datetime.now(_scheduler.timezone) + delay,
+            args=[application],
+            id='reminder_next_due',
+            replace_existing=True
+        )
     except Exception as e:
-        logger.error(f"Error processing reminders: {e}")
+        logger.error(f"Error scheduling next reminder run: {e}")
 
 async def check_overdue_meetings(application):
     """Check for overdue meetings and notify admins."""
     try:
-        reminder_service = ReminderService()
-        await reminder_service.check_overdue_meetings(application.bot)
+        await _reminder_service.check_overdue_meetings(application.bot)
         logger.info("Checked overdue meetings")
     except Exception as e:
         logger.error(f"Error checking overdue meetings: {e}")
\ No newline at end of file
@@ -11,6 +11,7 @@ from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 import json
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -425,21 +426,28 @@ class StartupValidator:
             ("System Dependencies", self.validate_system_dependencies)
         ]
         
-        for category_name, validator_func in validation_categories:
+        def run_category(category_name, validator_func) -> List[ValidationResult]:
             logger.info(f"🔍 Validating {category_name}...")
             try:
                 category_results = validator_func()
-                all_results.extend(category_results)
                 logger.info(f"✅ {category_name} validation completed: {len(category_results)} checks")
+                return category_results
             except Exception as e:
                 logger.error(f"❌ {category_name} validation failed: {e}")
-                all_results.append(ValidationResult(
+                return [ValidationResult(
                     check_name=f"category_{category_name.lower().replace(' ', '_')}",
                     passed=False,
                     severity="critical",
                     message=f"Validation category failed: {e}",
                     recommendation="Check system configuration"
-                ))
+                )]
+        
+        # Categories are independent and I/O-bound: run them in parallel,
+        # results are collected in category order so the report stays stable
+        with ThreadPoolExecutor(max_workers=len(validation_categories)) as executor:
+            futures = [executor.submit(run_category, name, func) for name, func in validation_categories]
+            for future in futures:
+                all_results.extend(future.result())
         
         # Analyze results
         analysis = self._analyze_validation_results(all_results)
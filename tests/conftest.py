@@ -0,0 +1,66 @@
+"""
+🧪 SHARED TEST FIXTURES
+Isolated SQLite database for tests that exercise services against real tables.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+
+def _clear_caches():
+    """Drop every process-wide cache so tests never see each other's data"""
+    from services import owner_service
+    from services.user_service import UserService
+
+    owner_service.OwnerService.invalidate_calendar_cache()  # also clears the available-slots cache
+    owner_service._owner_cache.clear()
+    UserService.invalidate_user_cache()
+
+
+@pytest.fixture
+def isolated_db(tmp_path):
+    """Bind SessionLocal (and so get_db/update_session_scope) to a fresh SQLite file"""
+    from sqlalchemy import create_engine
+    import database
+
+    test_engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        connect_args={"check_same_thread": False}
+    )
+    database.Base.metadata.create_all(bind=test_engine)
+    database.SessionLocal.configure(bind=test_engine)
+    _clear_caches()
+
+    yield test_engine
+
+    database.SessionLocal.configure(bind=database.engine)
+    _clear_caches()
+    test_engine.dispose()
+
+
+@pytest.fixture
+def make_user(isolated_db):
+    """Factory that inserts a user and returns its id"""
+    from database import get_db, User, UserRole, UserStatus, Department
+
+    def _make_user(telegram_id, role=UserRole.MANAGER, status=UserStatus.ACTIVE, **fields):
+        with get_db() as db:
+            user = User(
+                telegram_id=telegram_id,
+                first_name=fields.pop("first_name", f"User{telegram_id}"),
+                last_name=fields.pop("last_name", "Test"),
+                department=fields.pop("department", Department.FINANCE),
+                role=role,
+                status=status,
+                **fields
+            )
+            db.add(user)
+            db.commit()
+            return user.id
+
+    return _make_user
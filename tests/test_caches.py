@@ -0,0 +1,209 @@
+"""
+🧪 CACHE INVALIDATION TESTS
+The access decorators, the owner list and the "available slots" menu are served from
+process-wide caches. Every write path that changes the underlying data must invalidate
+them, so the very next read sees the new value instead of waiting for the TTL.
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from database import get_db, update_session_scope, UserRole, UserStatus, Meeting, MeetingStatus
+from services.owner_service import OwnerService
+from services.user_service import UserService
+from utils.decorators import require_manager, require_owner, require_registration
+
+
+def _update(telegram_id):
+    """Minimal Telegram update from a human user"""
+    return SimpleNamespace(
+        effective_user=SimpleNamespace(
+            id=telegram_id, is_bot=False, username=f"user{telegram_id}",
+            first_name="First", last_name="Last"
+        ),
+        effective_message=SimpleNamespace(reply_text=AsyncMock())
+    )
+
+
+def _guarded(decorator):
+    """Handler wrapped in an access decorator; returns "ok" when let through"""
+    @decorator
+    async def handler(update, context):
+        return "ok"
+    return handler
+
+
+async def _call(handler, telegram_id):
+    """Run a decorated handler inside its own update scope, like the application does"""
+    update = _update(telegram_id)
+    with update_session_scope():
+        result = await handler(update, None)
+    replies = [call.args[0] for call in update.effective_message.reply_text.await_args_list]
+    return result, replies
+
+
+@pytest.fixture
+def admin_ids():
+    """Patch the cached admin ID set for the duration of a test"""
+    from config import settings
+
+    def _set(*ids):
+        settings.__dict__["admin_ids_set"] = frozenset(ids)
+
+    original = settings.__dict__.get("admin_ids_set")
+    yield _set
+    if original is None:
+        settings.__dict__.pop("admin_ids_set", None)
+    else:
+        settings.__dict__["admin_ids_set"] = original
+
+
+class TestUserAccessCache:
+    """UserService.get_user_access (decorators) sees role/status changes immediately"""
+
+    @pytest.mark.asyncio
+    async def test_approval_is_seen_by_next_decorator_check(self, make_user):
+        user_id = make_user(300, role=UserRole.PENDING)
+        handler = _guarded(require_registration)
+
+        result, replies = await _call(handler, 300)
+        assert result is None and "ожидает одобрения" in replies[0]
+
+        with get_db() as db:
+            assert UserService(db).approve_user(user_id)
+
+        result, _ = await _call(handler, 300)
+        assert result == "ok"
+
+    @pytest.mark.asyncio
+    async def test_status_change_is_seen_by_next_lookup(self, make_user):
+        user_id = make_user(301)
+        assert UserService.get_user_access(301).status == UserStatus.ACTIVE
+
+        with get_db() as db:
+            assert UserService(db).update_user_status(user_id, UserStatus.VACATION)
+
+        assert UserService.get_user_access(301).status == UserStatus.VACATION
+
+    @pytest.mark.asyncio
+    async def test_deleted_user_is_rejected_by_next_decorator_check(self, make_user):
+        user_id = make_user(302)
+        handler = _guarded(require_manager)
+        assert (await _call(handler, 302))[0] == "ok"
+
+        with get_db() as db:
+            assert UserService(db).delete_user(user_id)
+
+        result, replies = await _call(handler, 302)
+        assert result is None and "не зарегистрированы" in replies[0]
+
+    @pytest.mark.asyncio
+    async def test_unknown_user_is_not_cached(self, make_user):
+        handler = _guarded(require_registration)
+        assert (await _call(handler, 303))[0] is None
+
+        make_user(303)
+        assert (await _call(handler, 303))[0] == "ok"
+
+
+class TestOwnerCache:
+    """Owner promotion by require_owner reaches the user and owner caches"""
+
+    @pytest.mark.asyncio
+    async def test_promotion_is_seen_by_next_checks(self, make_user, admin_ids):
+        make_user(400, role=UserRole.MANAGER, first_name="Promoted")
+        admin_ids(400)
+
+        assert UserService.get_user_access(400).role == UserRole.MANAGER
+        assert OwnerService.get_all_owners() == []
+
+        assert (await _call(_guarded(require_owner), 400))[0] == "ok"
+
+        assert UserService.get_user_access(400).role == UserRole.OWNER
+        assert [owner.first_name for owner in OwnerService.get_all_owners()] == ["Promoted"]
+
+    @pytest.mark.asyncio
+    async def test_auto_created_owner_is_seen_by_next_checks(self, isolated_db, admin_ids):
+        admin_ids(401)
+        assert OwnerService.get_all_owners() == []
+
+        assert (await _call(_guarded(require_owner), 401))[0] == "ok"
+
+        assert UserService.get_user_access(401).role == UserRole.OWNER
+        assert [owner.telegram_id for owner in OwnerService.get_all_owners()] == [401]
+
+
+class TestAvailableSlotsCache:
+    """The "available slots" menu is recalculated after a meeting is booked or cancelled"""
+
+    @pytest.fixture
+    def calculations(self):
+        """Count recalculations; every calculation returns a distinct result"""
+        results = iter({"2030-01-0%d" % n: ["10:00"]} for n in range(1, 10))
+        with patch.object(OwnerService, "_calculate_available_slots", side_effect=lambda days_ahead: next(results)) as calc:
+            yield calc
+
+    @pytest.fixture
+    def meeting_service(self, make_user):
+        from services.meeting_service import MeetingService
+
+        make_user(501, role=UserRole.OWNER, google_calendar_id="owner@example.com", oauth_credentials="{}")
+        manager_id = make_user(502, google_calendar_id="manager@example.com", oauth_credentials="{}")
+
+        db_context = get_db()
+        db = db_context.__enter__()
+        service = MeetingService(db)
+        service.calendar_service = MagicMock(is_available=True)
+        service.dual_calendar_creator = MagicMock()
+        service.dual_calendar_creator.create_meeting_in_both_calendars.return_value = {
+            "success": True, "manager_event_id": "m1", "owner_event_id": "o1", "meet_link": None, "errors": []
+        }
+        service.dual_calendar_creator.delete_meeting_from_both_calendars_dual.return_value = {
+            "success": True, "total_deleted": 2, "errors": []
+        }
+        service.manager_id = manager_id
+        yield service
+        db_context.__exit__(None, None, None)
+
+    def test_cached_between_calls(self, isolated_db, calculations):
+        first = OwnerService.get_available_slots_for_both_owners(14)
+        assert OwnerService.get_available_slots_for_both_owners(14) == first
+        assert calculations.call_count == 1
+
+    def test_recalculated_after_meeting_created_and_cancelled(self, meeting_service, calculations):
+        before = OwnerService.get_available_slots_for_both_owners(14)
+
+        with patch.object(OwnerService, "are_both_owners_available", return_value=True):
+            meeting = meeting_service.create_meeting(meeting_service.manager_id, datetime.now() + timedelta(days=3))
+        assert meeting is not None
+
+        after_booking = OwnerService.get_available_slots_for_both_owners(14)
+        assert after_booking != before
+        assert calculations.call_count == 2
+
+        assert meeting_service.cancel_meeting(meeting.id)
+        with get_db() as db:
+            assert db.query(Meeting.status).filter(Meeting.id == meeting.id).scalar() == MeetingStatus.CANCELLED
+
+        assert OwnerService.get_available_slots_for_both_owners(14) != after_booking
+        assert calculations.call_count == 3
+
+    def test_result_raced_by_invalidation_is_not_stored(self, isolated_db):
+        """A meeting booked while slots are being calculated must not leave the stale result cached"""
+        calls = []
+
+        def calculate(days_ahead):
+            calls.append(days_ahead)
+            if len(calls) == 1:
+                OwnerService.invalidate_available_slots_cache()  # concurrent booking
+                return {"stale": ["10:00"]}
+            return {"fresh": ["10:00"]}
+
+        with patch.object(OwnerService, "_calculate_available_slots", side_effect=calculate):
+            assert OwnerService.get_available_slots_for_both_owners(14) == {"stale": ["10:00"]}
+            assert OwnerService.get_available_slots_for_both_owners(14) == {"fresh": ["10:00"]}
+            assert OwnerService.get_available_slots_for_both_owners(14) == {"fresh": ["10:00"]}
+        assert len(calls) == 2
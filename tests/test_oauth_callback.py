@@ -0,0 +1,71 @@
+"""
+🧪 OAUTH CALLBACK TESTS
+The Google token exchange is blocking, so oauth_callback_handler runs it in a worker
+thread: the event loop keeps serving Telegram updates while the exchange is in flight.
+"""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from services.oauth_service import oauth_service
+from utils.oauth_handlers import oauth_callback_handler
+
+
+def _request(**query):
+    return SimpleNamespace(query=query)
+
+
+def _application():
+    return SimpleNamespace(bot=SimpleNamespace(send_message=AsyncMock()))
+
+
+class TestOAuthCallback:
+
+    @pytest.mark.asyncio
+    async def test_token_exchange_runs_off_the_event_loop(self):
+        loop_thread = threading.get_ident()
+        exchange_started = threading.Event()
+        release_exchange = threading.Event()
+        exchange_threads = []
+
+        def blocking_exchange(code, state):
+            exchange_threads.append(threading.get_ident())
+            exchange_started.set()
+            release_exchange.wait(5)
+            return {"success": True, "telegram_id": 42, "email": "manager@example.com"}
+
+        application = _application()
+        with patch.object(oauth_service, "handle_oauth_callback", side_effect=blocking_exchange):
+            callback = asyncio.create_task(oauth_callback_handler(_request(code="c", state="s"), application))
+            # The loop is free while the exchange blocks its thread
+            assert await asyncio.to_thread(exchange_started.wait, 5)
+            assert not callback.done()
+            release_exchange.set()
+            response = await callback
+
+        assert exchange_threads and exchange_threads[0] != loop_thread
+        assert response.status == 200
+        application.bot.send_message.assert_awaited_once()
+        assert application.bot.send_message.await_args.kwargs["chat_id"] == 42
+
+    @pytest.mark.asyncio
+    async def test_failed_exchange_returns_error_page(self):
+        application = _application()
+        with patch.object(oauth_service, "handle_oauth_callback", return_value={"success": False, "error": "invalid_grant"}):
+            response = await oauth_callback_handler(_request(code="c", state="s"), application)
+
+        assert response.status == 400
+        assert "invalid_grant" in response.text
+        application.bot.send_message.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_missing_params_skip_exchange(self):
+        with patch.object(oauth_service, "handle_oauth_callback") as exchange:
+            response = await oauth_callback_handler(_request(code="c"), _application())
+
+        assert response.status == 400
+        exchange.assert_not_called()
@@ -0,0 +1,152 @@
+"""
+🧪 OWNER TIME SLOT TESTS
+Slots are written with INSERT ... ON CONFLICT on ix_oa_owner_day_slot: a slot that was
+turned off is re-activated in place instead of being inserted twice.
+"""
+
+import sys
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+from database import get_db, ensure_model_indexes, OwnerAvailability, UserRole
+from services.owner_service import OwnerService
+
+MONDAY = 0
+INDEX_NAME = "ix_oa_owner_day_slot"
+
+
+@pytest.fixture
+def owner_id(make_user):
+    return make_user(101, role=UserRole.OWNER)
+
+
+def _rows(owner_id, day_of_week=MONDAY):
+    """All stored rows of the day as {time_slot: [is_active, ...]}"""
+    with get_db() as db:
+        rows = db.query(OwnerAvailability.time_slot, OwnerAvailability.is_active).filter(
+            OwnerAvailability.owner_id == owner_id,
+            OwnerAvailability.day_of_week == day_of_week
+        ).all()
+    result = {}
+    for time_slot, is_active in rows:
+        result.setdefault(time_slot, []).append(bool(is_active))
+    return result
+
+
+class TestSlotUpsert:
+    """set/add/remove keep one row per slot and re-activate disabled slots"""
+
+    def test_set_reactivates_disabled_slot(self, owner_id):
+        assert OwnerService.set_owner_time_slots(owner_id, MONDAY, ["09:00", "10:00"])
+        assert OwnerService.set_owner_time_slots(owner_id, MONDAY, ["10:00"])
+        assert _rows(owner_id) == {"09:00": [False], "10:00": [True]}
+
+        assert OwnerService.set_owner_time_slots(owner_id, MONDAY, ["09:00", "10:00"])
+        assert _rows(owner_id) == {"09:00": [True], "10:00": [True]}
+        assert OwnerService.get_owner_time_slots(owner_id, MONDAY) == ["09:00", "10:00"]
+
+    def test_add_reactivates_disabled_slot(self, owner_id):
+        OwnerService.set_owner_time_slots(owner_id, MONDAY, ["09:00", "10:00"])
+        OwnerService.set_owner_time_slots(owner_id, MONDAY, ["10:00"])
+
+        assert OwnerService.add_owner_time_slot(owner_id, MONDAY, "09:00")
+        assert _rows(owner_id) == {"09:00": [True], "10:00": [True]}
+        # Already active: nothing to add
+        assert not OwnerService.add_owner_time_slot(owner_id, MONDAY, "09:00")
+        assert OwnerService.get_owner_time_slots(owner_id, MONDAY) == ["09:00", "10:00"]
+
+    def test_remove_then_add_and_set_restore_slot(self, owner_id):
+        OwnerService.set_owner_time_slots(owner_id, MONDAY, ["09:00", "10:00"])
+        OwnerService.set_owner_time_slots(owner_id, MONDAY, ["10:00"])
+
+        # Removing a disabled slot deletes its row
+        assert OwnerService.remove_owner_time_slot(owner_id, MONDAY, "09:00")
+        assert _rows(owner_id) == {"10:00": [True]}
+        assert not OwnerService.remove_owner_time_slot(owner_id, MONDAY, "09:00")
+
+        assert OwnerService.add_owner_time_slot(owner_id, MONDAY, "09:00")
+        assert OwnerService.remove_owner_time_slot(owner_id, MONDAY, "10:00")
+        assert OwnerService.set_owner_time_slots(owner_id, MONDAY, ["09:00", "10:00"])
+        assert _rows(owner_id) == {"09:00": [True], "10:00": [True]}
+
+
+class TestModelIndexes:
+    """init_db de-duplicates slots and creates the declared indexes in an existing database"""
+
+    def _index_names(self, engine):
+        with engine.connect() as conn:
+            return conn.execute(text(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'owner_availability'"
+            )).scalars().all()
+
+    def test_duplicates_keep_active_row(self, isolated_db, owner_id):
+        with isolated_db.begin() as conn:
+            conn.execute(text(f"DROP INDEX {INDEX_NAME}"))
+            conn.execute(
+                text("INSERT INTO owner_availability (id, owner_id, day_of_week, time_slot, is_active) "
+                     "VALUES (:id, :owner_id, 0, :time_slot, :is_active)"),
+                [
+                    # Older disabled copy next to the active slot: the active one must survive
+                    {"id": 1, "owner_id": owner_id, "time_slot": "09:00", "is_active": False},
+                    {"id": 2, "owner_id": owner_id, "time_slot": "09:00", "is_active": True},
+                    # Two active copies: the earliest wins
+                    {"id": 3, "owner_id": owner_id, "time_slot": "10:00", "is_active": True},
+                    {"id": 4, "owner_id": owner_id, "time_slot": "10:00", "is_active": True},
+                    # Only disabled copies: the earliest wins
+                    {"id": 5, "owner_id": owner_id, "time_slot": "11:00", "is_active": False},
+                    {"id": 6, "owner_id": owner_id, "time_slot": "11:00", "is_active": False},
+                ]
+            )
+
+        ensure_model_indexes(isolated_db)
+        ensure_model_indexes(isolated_db)  # idempotent
+
+        with isolated_db.connect() as conn:
+            remaining = conn.execute(text(
+                "SELECT id, time_slot, is_active FROM owner_availability ORDER BY id"
+            )).all()
+
+        assert [(row.id, row.time_slot, bool(row.is_active)) for row in remaining] == [
+            (2, "09:00", True), (3, "10:00", True), (5, "11:00", False)
+        ]
+        assert INDEX_NAME in self._index_names(isolated_db)
+
+    def test_init_db_creates_missing_indexes(self, isolated_db, monkeypatch):
+        """No dependency on the migrations package, which the Docker image does not ship"""
+        import database
+
+        declared = {index.name for table in database.Base.metadata.sorted_tables for index in table.indexes}
+        with isolated_db.begin() as conn:
+            for index_name in declared:
+                conn.execute(text(f"DROP INDEX {index_name}"))
+            # Superseded by ix_owner_avail_lookup
+            conn.execute(text("CREATE INDEX ix_oa_owner_day_active ON owner_availability (owner_id, day_of_week, is_active)"))
+        monkeypatch.setattr(database, "engine", isolated_db)
+        monkeypatch.setitem(sys.modules, "migrations", None)
+
+        database.init_db()
+
+        with isolated_db.connect() as conn:
+            index_names = set(conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'")).scalars())
+        assert declared <= index_names
+        assert "ix_oa_owner_day_active" not in index_names
+
+    def test_init_db_fails_when_index_cannot_be_created(self, isolated_db, owner_id, monkeypatch):
+        """Starting without the ON CONFLICT target would only break slot writes later"""
+        import database
+
+        with isolated_db.begin() as conn:
+            conn.execute(text(f"DROP INDEX {INDEX_NAME}"))
+        monkeypatch.setattr(database, "engine", isolated_db)
+        monkeypatch.setattr(database, "OWNER_SLOTS_DEDUPLICATE_SQL", "SELECT 1")
+        with isolated_db.begin() as conn:
+            conn.execute(
+                text("INSERT INTO owner_availability (owner_id, day_of_week, time_slot, is_active) "
+                     "VALUES (:owner_id, 0, '09:00', 1)"),
+                [{"owner_id": owner_id}, {"owner_id": owner_id}]
+            )
+
+        with pytest.raises(IntegrityError):
+            database.init_db()
@@ -0,0 +1,135 @@
+"""
+🧪 REMINDER BATCHING TESTS
+process_pending_reminders sends due reminders in rate-limited batches: the batch size
+halves on RetryAfter, throttled reminders are re-queued up to REMINDER_MAX_RETRIES times,
+and every batch's successes are marked sent with one bulk UPDATE.
+"""
+
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+from telegram.error import RetryAfter
+
+import services.reminder_service as reminder_module
+from database import get_db, Reminder
+from services.reminder_service import ReminderService, REMINDER_BATCH_SIZE, REMINDER_MAX_RETRIES
+
+TOTAL_REMINDERS = 40
+THROTTLED_ONCE = {1000, 1001, 1002}  # hit the rate limit on their first attempt only
+ALWAYS_THROTTLED = 1003
+BROKEN = 1004  # e.g. the user blocked the bot
+
+
+class FakeBot:
+    """Records every send_message attempt; raises for selected chats"""
+
+    def __init__(self):
+        self.attempts = Counter()
+        self.delivered = Counter()
+
+    async def send_message(self, chat_id, text):
+        self.attempts[chat_id] += 1
+        if chat_id == ALWAYS_THROTTLED or (chat_id in THROTTLED_ONCE and self.attempts[chat_id] == 1):
+            raise RetryAfter(0)
+        if chat_id == BROKEN:
+            raise RuntimeError("Forbidden: bot was blocked by the user")
+        self.delivered[chat_id] += 1
+
+
+@pytest.fixture
+def reminders(make_user):
+    """One due reminder per user; returns {telegram_id: reminder_id}"""
+    due = datetime.now() - timedelta(minutes=1)
+    user_ids = {telegram_id: make_user(telegram_id) for telegram_id in range(1000, 1000 + TOTAL_REMINDERS)}
+    reminder_ids = {}
+    with get_db() as db:
+        for telegram_id, user_id in user_ids.items():
+            reminder = Reminder(user_id=user_id, reminder_type="schedule_meeting_7d", scheduled_for=due)
+            db.add(reminder)
+            db.flush()
+            reminder_ids[telegram_id] = reminder.id
+        db.commit()
+    return reminder_ids
+
+
+@pytest.fixture
+def windows(monkeypatch):
+    """Skip the real per-window sleeps; record how many sends happened before each one"""
+    bot = FakeBot()
+    window_ends = []
+
+    async def fake_sleep(delay):
+        window_ends.append(sum(bot.attempts.values()))
+
+    monkeypatch.setattr(reminder_module.asyncio, "sleep", fake_sleep)
+    return bot, window_ends
+
+
+@pytest.fixture
+def marked(monkeypatch):
+    """Record the reminder IDs of every bulk UPDATE"""
+    calls = []
+    original = ReminderService._mark_reminders_sent
+
+    def recording(reminder_ids, sent_at):
+        calls.append(list(reminder_ids))
+        original(reminder_ids, sent_at)
+
+    monkeypatch.setattr(ReminderService, "_mark_reminders_sent", staticmethod(recording))
+    return calls
+
+
+class TestProcessPendingReminders:
+
+    @pytest.mark.asyncio
+    async def test_every_reminder_sent_and_marked_exactly_once(self, reminders, windows, marked):
+        bot, window_ends = windows
+
+        await ReminderService().process_pending_reminders(bot)
+
+        delivered_ok = set(reminders) - {ALWAYS_THROTTLED, BROKEN}
+        # No duplicate deliveries, nobody skipped
+        assert set(bot.delivered) == delivered_ok
+        assert all(count == 1 for count in bot.delivered.values())
+
+        # Each delivered reminder is in exactly one bulk UPDATE; failures are in none
+        marked_ids = [reminder_id for batch in marked for reminder_id in batch]
+        assert Counter(marked_ids) == Counter(reminders[telegram_id] for telegram_id in delivered_ok)
+
+        with get_db() as db:
+            rows = {row.id: row for row in db.query(Reminder.id, Reminder.sent, Reminder.sent_at)}
+        for telegram_id, reminder_id in reminders.items():
+            if telegram_id in delivered_ok:
+                assert rows[reminder_id].sent and rows[reminder_id].sent_at is not None
+            else:
+                assert not rows[reminder_id].sent and rows[reminder_id].sent_at is None
+
+    @pytest.mark.asyncio
+    async def test_throttled_reminder_retried_up_to_limit(self, reminders, windows, marked):
+        bot, _ = windows
+
+        await ReminderService().process_pending_reminders(bot)
+
+        assert bot.attempts[ALWAYS_THROTTLED] == 1 + REMINDER_MAX_RETRIES
+        assert all(bot.attempts[telegram_id] == 2 for telegram_id in THROTTLED_ONCE)
+        assert bot.attempts[BROKEN] == 1  # other errors are not retried
+
+    @pytest.mark.asyncio
+    async def test_batch_size_halves_on_retry_after(self, reminders, windows, marked):
+        bot, window_ends = windows
+
+        await ReminderService().process_pending_reminders(bot)
+
+        batch_sizes = [end - start for start, end in zip([0] + window_ends, window_ends)]
+        # First window hits RetryAfter, so the next one is half as large
+        assert batch_sizes[0] == REMINDER_BATCH_SIZE
+        assert batch_sizes[1] == REMINDER_BATCH_SIZE // 2
+
+    @pytest.mark.asyncio
+    async def test_nothing_due_sends_nothing(self, isolated_db, windows, marked):
+        bot, window_ends = windows
+
+        await ReminderService().process_pending_reminders(bot)
+
+        assert not bot.attempts and not marked and not window_ends
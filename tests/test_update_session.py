@@ -0,0 +1,88 @@
+"""
+🧪 PER-UPDATE SESSION TESTS
+Every Telegram update shares one SQLAlchemy session (update_session_scope).
+Data cached across updates must stay usable after that session commits and closes.
+"""
+
+from database import get_db, update_session_scope, User, UserRole
+
+
+class TestUpdateSessionScope:
+    """Two scoped updates processed back to back"""
+
+    def test_get_db_reuses_update_session(self, isolated_db):
+        """Inside one update every get_db() yields the same session"""
+        with update_session_scope() as shared:
+            with get_db() as first, get_db() as second:
+                assert first is shared
+                assert second is shared
+
+    def test_cached_owners_survive_commit_in_previous_update(self, isolated_db, make_user):
+        """Regression: a commit in update #1 must not break cached owners in update #2"""
+        from services.owner_service import OwnerService
+
+        make_user(101, role=UserRole.OWNER, first_name="Owner")
+
+        # Update #1: booking flow loads owners, then commits through the shared session
+        with update_session_scope():
+            assert [owner.first_name for owner in OwnerService.get_all_owners()] == ["Owner"]
+            with get_db() as db:
+                db.commit()
+
+        # Update #2 (within OWNER_CACHE_TTL): served from cache, attributes must still load
+        with update_session_scope():
+            owners = OwnerService.get_all_owners()
+            assert [(owner.first_name, owner.telegram_id) for owner in owners] == [("Owner", 101)]
+
+    def test_cached_owners_expose_fields_used_by_callers(self, isolated_db, make_user):
+        """Cached owner rows carry every attribute the booking and notification code reads"""
+        from services.owner_service import OwnerService
+
+        make_user(
+            102, role=UserRole.OWNER, first_name="Owner", email="owner@example.com",
+            google_calendar_id="cal@example.com", oauth_credentials='{"token": "x"}'
+        )
+
+        with update_session_scope():
+            OwnerService.get_all_owners()
+        (owner,) = OwnerService.get_all_owners()
+        assert (owner.id, owner.telegram_id, owner.first_name, owner.last_name) == (1, 102, "Owner", "Test")
+        assert owner.email == "owner@example.com"
+        assert owner.google_calendar_id == "cal@example.com"
+        assert owner.oauth_credentials == '{"token": "x"}'
+
+    def test_uncommitted_changes_do_not_leak_between_blocks(self, isolated_db, make_user):
+        """A get_db() block that does not commit is rolled back like a closed session"""
+        make_user(201, first_name="Before")
+
+        with update_session_scope():
+            with get_db() as db:
+                db.query(User).filter(User.telegram_id == 201).first().first_name = "After"
+            with get_db() as db:
+                assert db.query(User.first_name).filter(User.telegram_id == 201).scalar() == "Before"
+
+    def test_nested_block_keeps_outer_changes(self, isolated_db, make_user):
+        """Leaving a nested get_db() must not discard the outer block's pending writes"""
+        make_user(202, first_name="Before")
+
+        with update_session_scope():
+            with get_db() as db:
+                db.query(User).filter(User.telegram_id == 202).first().first_name = "After"
+                with get_db() as nested:
+                    nested.query(User.id).filter(User.telegram_id == 202).scalar()
+                db.commit()
+            with get_db() as db:
+                assert db.query(User.first_name).filter(User.telegram_id == 202).scalar() == "After"
+
+    def test_connection_released_between_blocks(self, isolated_db, make_user):
+        """The update's session does not hold a pooled connection across the handler's awaits"""
+        make_user(203, first_name="Loaded")
+
+        with update_session_scope() as shared:
+            with get_db() as db:
+                user = db.query(User).filter(User.telegram_id == 203).first()
+                assert isolated_db.pool.checkedout() == 1
+            assert not shared.in_transaction()
+            assert isolated_db.pool.checkedout() == 0
+            # Loaded attributes stay readable, as after closing a separate session
+            assert user.first_name == "Loaded"